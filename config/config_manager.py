@@ -1,57 +1,93 @@
+import copy
+import hashlib
 import json
 import os
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+def _encode_default(obj):
+    """Serialize extension sets as sorted lists"""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class ConfigManager:
     """Handles saving and loading application configuration"""
     
     def __init__(self, config_file: str = "file_organizer_config.json"):
         self.config_file = config_file
         self.default_file_types = {
-        "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp", ".tiff", ".ico"],
-        "Documents": [".pdf", ".docx", ".doc", ".txt", ".rtf", ".odt", ".xlsx", ".xls", ".ods",
-                  ".pptx", ".ppt", ".csv", ".md"],
-        "Videos": [".mp4", ".avi", ".mov", ".mkv", ".wmv", ".webm", ".flv", ".mpeg"],
-        "Audio": [".mp3", ".wav", ".ogg", ".m4a", ".flac", ".aac", ".wma", ".aiff"],
-        "Archives": [".zip", ".rar", ".7z", ".tar", ".gz", ".bz2", ".xz", ".iso"],
-        "Code": [".py", ".js", ".ts", ".html", ".css", ".scss", ".java", ".cpp", ".c", ".cs",
-             ".json", ".xml", ".php", ".sh", ".bat", ".go", ".rb", ".swift"],
-        "Executables": [".exe", ".msi", ".apk", ".appimage", ".dmg", ".deb", ".rpm"],
-        "Fonts": [".ttf", ".otf", ".woff", ".woff2"],
-        "Design": [".psd", ".ai", ".xd", ".sketch", ".fig"],
-        "Ebooks": [".epub", ".mobi", ".azw", ".djvu"]
+        "Images": frozenset({".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp", ".tiff", ".ico"}),
+        "Documents": frozenset({".pdf", ".docx", ".doc", ".txt", ".rtf", ".odt", ".xlsx", ".xls", ".ods",
+                  ".pptx", ".ppt", ".csv", ".md"}),
+        "Videos": frozenset({".mp4", ".avi", ".mov", ".mkv", ".wmv", ".webm", ".flv", ".mpeg"}),
+        "Audio": frozenset({".mp3", ".wav", ".ogg", ".m4a", ".flac", ".aac", ".wma", ".aiff"}),
+        "Archives": frozenset({".zip", ".rar", ".7z", ".tar", ".gz", ".bz2", ".xz", ".iso"}),
+        "Code": frozenset({".py", ".js", ".ts", ".html", ".css", ".scss", ".java", ".cpp", ".c", ".cs",
+             ".json", ".xml", ".php", ".sh", ".bat", ".go", ".rb", ".swift"}),
+        "Executables": frozenset({".exe", ".msi", ".apk", ".appimage", ".dmg", ".deb", ".rpm"}),
+        "Fonts": frozenset({".ttf", ".otf", ".woff", ".woff2"}),
+        "Design": frozenset({".psd", ".ai", ".xd", ".sketch", ".fig"}),
+        "Ebooks": frozenset({".epub", ".mobi", ".azw", ".djvu"})
     }
+        
+        # Built once; load_config only copies the top level of it
+        self._default_config_template = {
+            'organize_by_date': False,
+            'move_files': True,
+            'create_folders': True,
+            'skip_hidden': True,
+            'custom_tags': '',
+            'last_folder': '',
+            'file_types': self.default_file_types,
+            'manual_assignments': {}
+        }
+        
+        # Last parsed config, keyed by the file's (mtime_ns, size)
+        self._cache = None
+        self._cache_key = None
+        
+        # Digest of the last written bytes and the file's key right after writing them
+        self._saved_digest = None
+        self._saved_file_key = None
 
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from file and sync file_types with updated defaults"""
-        default_config = {
-        'organize_by_date': False,
-        'move_files': True,
-        'create_folders': True,
-        'skip_hidden': True,
-        'custom_tags': '',
-        'last_folder': '',
-        'file_types': self.default_file_types.copy(),
-        'manual_assignments': {}
-        }
+        default_config = dict(self._default_config_template)
+        # Extension sets are frozen, so copying the category dict is enough
+        default_config['file_types'] = dict(self.default_file_types)
+        default_config['manual_assignments'] = {}
     
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                st = os.stat(self.config_file)
+                cache_key = (st.st_mtime_ns, st.st_size)
+                if cache_key == self._cache_key:
+                    return copy.deepcopy(self._cache)
+                
+                with open(self.config_file, 'rb') as f:
+                    data = f.read()
+                config = orjson.loads(data) if orjson is not None else json.loads(data)
 
             # Merge root-level config values
                 default_config.update(config)
 
             # ⚠ Merge file_types with updated defaults
                 file_types_from_file = config.get('file_types', {})
-                synced_file_types = self.default_file_types.copy()
+                synced_file_types = dict(self.default_file_types)
 
             # Keep user-modified categories and also add new default ones
                 for category, extensions in file_types_from_file.items():
-                    synced_file_types[category] = list(set(extensions))
+                    synced_file_types[category] = frozenset(extensions)
 
                 default_config['file_types'] = synced_file_types
+                
+                self._cache = copy.deepcopy(default_config)
+                self._cache_key = cache_key
 
         except Exception as e:
             print(f"Error loading config: {e}. Using defaults.")
@@ -61,13 +97,38 @@ class ConfigManager:
     def save_config(self, config: Dict[str, Any]) -> bool:
         """Save configuration to file"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
+            if orjson is not None:
+                data = orjson.dumps(config, default=_encode_default, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(config, indent=2, default=_encode_default).encode('utf-8')
+            
+            # Settings are saved after every organize and on exit, usually unchanged
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest == self._saved_digest and self._file_key() == self._saved_file_key:
+                return True
+            
+            # Write to a temporary file and swap it in, so a crash never leaves half a config
+            temp_file = f"{self.config_file}.tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, self.config_file)
+            
+            self._cache_key = None
+            self._saved_digest = digest
+            self._saved_file_key = self._file_key()
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
             return False
     
-    def get_default_file_types(self) -> Dict[str, list]:
+    def _file_key(self):
+        """(mtime_ns, size) of the config file, or None if it doesn't exist"""
+        try:
+            st = os.stat(self.config_file)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+    
+    def get_default_file_types(self) -> Dict[str, frozenset]:
         """Get default file type categories"""
         return self.default_file_types.copy()
\ No newline at end of file
@@ -1,26 +1,142 @@
 import os
+import errno
+import heapq
+import queue
+import re
 import shutil
 import stat
+import sys
 import time
-from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Callable
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Tuple, Optional, Callable, Pattern, Iterator, Iterable
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, statistics fall back to pure Python
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, numpy's searchsorted/bincount is used instead
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _bucket_sizes(sizes, thresholds):
+        """Count sizes per bucket, bucket i holding sizes below thresholds[i]"""
+        counts = np.zeros(len(thresholds) + 1, np.int64)
+        for size in sizes:
+            index = 0
+            while index < len(thresholds) and size >= thresholds[index]:
+                index += 1
+            counts[index] += 1
+        return counts
+else:
+    _bucket_sizes = None
+
+class Throttler:
+    """Forward calls to a UI callback at most once per interval, plus the final call"""
+    
+    def __init__(self, callback: Callable, thread_safe_update: Callable,
+                 interval: float = 1 / 30, is_final: Callable = None):
+        self.callback = callback
+        self.thread_safe_update = thread_safe_update
+        self.interval = interval  # ~30 Hz, faster than that is never perceivable
+        self.is_final = is_final
+        self.last_emit = float('-inf')
+    
+    def __call__(self, *args):
+        now = time.monotonic()
+        if now - self.last_emit >= self.interval or (self.is_final and self.is_final(*args)):
+            self.last_emit = now
+            self.thread_safe_update(0, lambda: self.callback(*args))
 
 class FileOperations:
     """Handles all file system operations with threading support"""
     
+    # Upper bounds for the size ranges: < 1KB, < 1MB, < 100MB, < 1GB, and anything larger
+    SIZE_THRESHOLDS = (1024, 1024 * 1024, 100 * 1024 * 1024, 1024 * 1024 * 1024)
+    SIZE_RANGES = ('tiny', 'small', 'medium', 'large', 'huge')
+    
+    # Folders with at least this many files are aggregated with numpy when it is available
+    VECTORIZE_MIN_FILES = 10000
+    
+    # Number of filtered folder listings kept by get_files_in_folder
+    SCAN_CACHE_SIZE = 8
+    
+    # Entries whose sizes are looked up together when a size filter is set
+    STAT_BATCH_SIZE = 256
+    
+    # Concurrent copies/cross-device moves; I/O bound, so well above the core count
+    COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+    
     def __init__(self, file_types: Dict[str, List[str]]):
         self.file_types = file_types
-        self._cancel_flag = False
+        self._cancel_event = threading.Event()
+        
+        # One long-lived thread runs organize and undo jobs instead of a new thread per job
+        self._operation_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='file-ops')
+        self._stat_pool: Optional[ThreadPoolExecutor] = None  # Created on first size-filtered scan
+        self._stat_pool_lock = threading.Lock()
+        
+        # Opt-in: "copies" on the same device become hard links sharing the original's data
+        self.hardlink_copies = False
+        
+        # Directory listings reused by get_unique_path during an organize run
+        self._dir_names: Dict[str, set] = {}
+        self._dir_names_lock = threading.Lock()
+        
+        # (inputs key, plan) of the last preview, reused once by an unchanged organize run
+        self._preview_plan: Optional[Tuple[Tuple, List[Tuple[str, str]]]] = None
+        
+        # Filtered folder listings keyed by (folder, mtime_ns, filters), least recently used first;
+        # read from the UI and I/O threads and cleared by the organize worker, hence the lock
+        self._scan_cache: OrderedDict = OrderedDict()
+        self._scan_cache_lock = threading.Lock()
+    
+    @property
+    def file_types(self) -> Dict[str, List[str]]:
+        """File type categories used for organization"""
+        return self._file_types
+    
+    @file_types.setter
+    def file_types(self, file_types: Dict[str, List[str]]):
+        """Set file type categories and rebuild the extension lookup"""
+        self._file_types = file_types
+        
+        # Inverted index so each file needs a single dict lookup;
+        # the first category listing an extension wins, as before
+        self._ext_to_cat = {}
+        # Multi-part extensions such as ".tar.gz", matched before the last extension
+        self._compound_ext_to_cat = {}
+        for category, extensions in file_types.items():
+            for ext in extensions:
+                self._ext_to_cat.setdefault(ext, category)
+                if ext.count('.') > 1:
+                    self._compound_ext_to_cat.setdefault(ext, category)
+        
+        # Fresh per-filename cache, so stale categories never survive an edit
+        self._category_cache = lru_cache(maxsize=4096)(self._lookup_category)
     
     def cancel_operation(self):
         """Cancel ongoing operation"""
-        self._cancel_flag = True
+        self._cancel_event.set()
     
     def reset_cancel_flag(self):
         """Reset cancel flag for new operations"""
-        self._cancel_flag = False
+        self._cancel_event.clear()
+    
+    def shutdown(self):
+        """Stop the worker threads; a running organize or undo job finishes first"""
+        self._operation_pool.shutdown(wait=False)
+        with self._stat_pool_lock:
+            if self._stat_pool is not None:
+                self._stat_pool.shutdown(wait=False)
     
     def get_file_size(self, file_path: str) -> int:
         """Get file size in bytes"""
@@ -37,51 +153,259 @@ class FileOperations:
     
     def get_file_category(self, filename: str) -> str:
         """Get category for a file based on its extension"""
-        ext = os.path.splitext(filename)[1].lower()
+        return self._category_cache(filename)
+    
+    def _lookup_category(self, filename: str) -> str:
+        """Resolve a filename's category from the extension index"""
+        if self._compound_ext_to_cat:
+            # Try every suffix starting at a dot, longest first, so ".tar.gz" wins over ".gz"
+            lowered = filename.lower()
+            pos = lowered.find('.', 1)
+            while pos != -1:
+                category = self._compound_ext_to_cat.get(lowered[pos:])
+                if category:
+                    return category
+                pos = lowered.find('.', pos + 1)
+        
+        # Same result as os.path.splitext: leading dots don't start an extension
+        head, dot, tail = filename.rpartition('.')
+        ext = f".{tail}".lower() if dot and head.strip('.') else ''
+        return self._ext_to_cat.get(ext, "Others")
+    
+    def compile_custom_tags(self, custom_tags: List[str]) -> Tuple[Optional[Pattern], Dict[str, str]]:
+        """
+        Compile custom tags into a single case-insensitive pattern
+        Returns: (pattern or None, {lowercased tag: original tag})
+        """
+        tag_map = {}
+        for tag in custom_tags:
+            tag_map.setdefault(tag.lower(), tag)
         
-        for category, extensions in self.file_types.items():
-            if ext in extensions:
-                return category
+        if not tag_map:
+            return None, tag_map
         
-        return "Others"
+        pattern = re.compile('|'.join(re.escape(tag) for tag in tag_map), re.IGNORECASE)
+        return pattern, tag_map
     
-    def get_custom_tag_category(self, filename: str, custom_tags: List[str]) -> Optional[str]:
+    def get_custom_tag_category(self, filename: str, tag_pattern: Optional[Pattern],
+                                tag_map: Dict[str, str]) -> Optional[str]:
         """Check if file matches any custom tags"""
-        filename_lower = filename.lower()
-        for tag in custom_tags:
-            if tag.lower() in filename_lower:
-                return tag
+        if tag_pattern is None:
+            return None
+        match = tag_pattern.search(filename)
+        if match:
+            return tag_map[match.group(0).lower()]
         return None
     
     def get_date_folder(self, file_path: str) -> str:
         """Get date-based folder name"""
         try:
-            stat = os.stat(file_path)
-            mod_time = datetime.fromtimestamp(stat.st_mtime)
-            return mod_time.strftime("%Y-%m")
+            return self.get_date_folder_from_mtime(os.stat(file_path).st_mtime)
         except Exception:
             return "Unknown-Date"
     
+    def get_date_folder_from_mtime(self, mtime: float) -> str:
+        """Get date-based folder name from an already known modification time"""
+        try:
+            return time.strftime("%Y-%m", time.localtime(mtime))
+        except (OverflowError, OSError, ValueError):
+            return "Unknown-Date"
+    
+    def iter_files_in_folder(self, folder: str, skip_hidden: bool = True,
+                             min_size_bytes: int = 0,
+                             max_size_bytes: int = float('inf')) -> Iterator[os.DirEntry]:
+        """Yield directory entries of files in folder that pass the size filter"""
+        # Without size limits there's no need to stat each file (a syscall per entry on POSIX)
+        size_filtered = self._size_filtered(min_size_bytes, max_size_bytes)
+        
+        def stat_passes(entry):
+            try:
+                file_size = entry.stat().st_size
+            except OSError:
+                file_size = 0
+            return min_size_bytes <= file_size <= max_size_bytes
+        
+        def filter_batch(batch):
+            # stat() releases the GIL, so a batch of them overlaps on a cold cache
+            pool = self._get_stat_pool() if len(batch) > 1 else None
+            results = pool.map(stat_passes, batch) if pool else map(stat_passes, batch)
+            return [entry for entry, passed in zip(batch, results) if passed]
+        
+        try:
+            # scandir hands back cached type/stat info, avoiding extra stat calls per file
+            with os.scandir(folder) as entries:
+                batch = []
+                for entry in entries:
+                    # Name check first: it never needs a syscall, unlike is_file() on symlinks
+                    if skip_hidden and entry.name.startswith('.'):
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if not size_filtered:
+                        yield entry
+                        continue
+                    
+                    # Apply size filtering a batch at a time
+                    batch.append(entry)
+                    if len(batch) >= self.STAT_BATCH_SIZE:
+                        yield from filter_batch(batch)
+                        batch = []
+                if batch:
+                    yield from filter_batch(batch)
+        except Exception as e:
+            raise Exception(f"Error reading folder: {str(e)}")
+    
+    def _get_stat_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Threads for parallel stat calls, or None where scandir already provides the stat"""
+        # On Windows DirEntry.stat() is answered from the directory listing itself
+        if os.name == 'nt':
+            return None
+        with self._stat_pool_lock:
+            if self._stat_pool is None:
+                self._stat_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='file-stat')
+        return self._stat_pool
+    
     def get_files_in_folder(self, folder: str, skip_hidden: bool = True,
                            min_size_bytes: int = 0, max_size_bytes: int = float('inf')) -> List[str]:
         """Get list of files in folder with size filtering"""
+        key = self._scan_cache_key(folder, skip_hidden, min_size_bytes, max_size_bytes)
+        files = self._cached_listing(key)
+        if files is None:
+            files = [entry.name for entry in
+                     self.iter_files_in_folder(folder, skip_hidden, min_size_bytes, max_size_bytes)]
+            if key:
+                with self._scan_cache_lock:
+                    self._scan_cache[key] = files
+                    if len(self._scan_cache) > self.SCAN_CACHE_SIZE:
+                        self._scan_cache.popitem(last=False)
+        
+        return list(files)
+    
+    def _cached_listing(self, key: Optional[Tuple]) -> Optional[List[str]]:
+        """Cached listing for key, marked as most recently used, or None"""
+        if key is None:
+            return None
+        with self._scan_cache_lock:
+            files = self._scan_cache.get(key)
+            if files is not None:
+                self._scan_cache.move_to_end(key)
+            return files
+    
+    def count_files_in_folder(self, folder: str, skip_hidden: bool = True,
+                              min_size_bytes: int = 0, max_size_bytes: int = float('inf'),
+                              progress_callback: Callable = None, batch_size: int = 5000) -> int:
+        """Count files passing the filters without building a list of names"""
+        files = self._cached_listing(
+            self._scan_cache_key(folder, skip_hidden, min_size_bytes, max_size_bytes))
+        if files is not None:
+            return len(files)
+        
+        entries = self.iter_files_in_folder(folder, skip_hidden, min_size_bytes, max_size_bytes)
+        count = 0
+        while True:
+            counted = sum(1 for _ in islice(entries, batch_size))
+            count += counted
+            if counted < batch_size:
+                return count
+            # Report the running total so huge folders show feedback while counting
+            if progress_callback:
+                progress_callback(count)
+    
+    def _scan_cache_key(self, folder: str, skip_hidden: bool,
+                        min_size_bytes: int, max_size_bytes: int) -> Optional[Tuple]:
+        """Key for the listing cache, or None if the listing can't be cached"""
+        # Editing a file in place changes its size but not the folder's mtime, so
+        # size-filtered listings are never cached
+        if self._size_filtered(min_size_bytes, max_size_bytes):
+            return None
+        # Adding, removing or renaming a file bumps the folder's mtime, which invalidates the key
         try:
-            all_files = [f for f in os.listdir(folder) 
-                        if os.path.isfile(os.path.join(folder, f))]
-            
-            if skip_hidden:
-                all_files = [f for f in all_files if not f.startswith('.')]
+            return (folder, os.stat(folder).st_mtime_ns, skip_hidden, min_size_bytes, max_size_bytes)
+        except OSError:
+            return None
+    
+    def clear_scan_cache(self):
+        """Forget cached folder listings"""
+        with self._scan_cache_lock:
+            self._scan_cache.clear()
+    
+    @staticmethod
+    def _size_filtered(min_size_bytes: int, max_size_bytes: int) -> bool:
+        """Check whether the size filter excludes anything"""
+        # The controller passes sys.maxsize, direct callers float('inf'), for no maximum
+        return min_size_bytes > 0 or max_size_bytes < sys.maxsize
+    
+    def _plan_organization(self, folder: str, custom_tags: List[str],
+                           organize_by_date: bool, skip_hidden: bool,
+                           manual_assignments: Dict[str, str],
+                           min_size_bytes: int = 0,
+                           max_size_bytes: int = float('inf')) -> List[Tuple[str, str]]:
+        """
+        Walk the folder once and resolve where each file belongs
+        Returns: [(filename, category)], category including the date folder if enabled
+        """
+        plan = []
+        categorize = self._build_categorizer(custom_tags, organize_by_date, manual_assignments)
+        is_cancelled = self._cancel_event.is_set
+        
+        # Entries are consumed as scandir produces them, never as a separate name list
+        for i, entry in enumerate(self.iter_files_in_folder(folder, skip_hidden,
+                                                            min_size_bytes, max_size_bytes)):
+            # Planning is cheap per file, so checking every 64 entries keeps cancel responsive
+            if i & 63 == 0 and is_cancelled():
+                break
+            plan.append((entry.name, categorize(entry)))
+        
+        return plan
+    
+    def _build_categorizer(self, custom_tags: List[str], organize_by_date: bool,
+                           manual_assignments: Dict[str, str]) -> Callable[[os.DirEntry], str]:
+        """
+        Build a category resolver that only runs the steps the chosen options need
+        Precedence: manual assignment, then custom tag, then file extension
+        """
+        get_category = self._category_cache
+        tag_pattern, tag_map = self.compile_custom_tags(custom_tags)
+        
+        if tag_pattern is not None:
+            search = tag_pattern.search
             
-            # Apply size filtering
-            filtered_files = []
-            for f in all_files:
-                file_path = os.path.join(folder, f)
-                if self.passes_size_filter(file_path, min_size_bytes, max_size_bytes):
-                    filtered_files.append(f)
+            def by_name(filename):
+                match = search(filename)
+                return tag_map[match.group(0).lower()] if match else get_category(filename)
+        else:
+            by_name = get_category
+        
+        if manual_assignments:
+            assigned = manual_assignments.get
+            by_rules = by_name
             
-            return filtered_files
-        except Exception as e:
-            raise Exception(f"Error reading folder: {str(e)}")
+            def by_name(filename):
+                return assigned(filename) or by_rules(filename)
+        
+        if not organize_by_date:
+            return lambda entry: by_name(entry.name)
+        
+        date_folder = self.get_date_folder_from_mtime
+        
+        def with_date(entry):
+            # Reuse the stat already cached on the entry by the size filter
+            try:
+                folder_name = date_folder(entry.stat().st_mtime)
+            except OSError:
+                folder_name = "Unknown-Date"
+            return f"{by_name(entry.name)}/{folder_name}"
+        
+        return with_date
+    
+    def _preview_from_plan(self, plan: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+        """Group a resolved plan into {category: [filenames]}"""
+        preview = {}
+        for filename, category in plan:
+            if category not in preview:
+                preview[category] = []
+            preview[category].append(filename)
+        return preview
     
     def get_organization_preview(self, folder: str, custom_tags: List[str], 
                                organize_by_date: bool, skip_hidden: bool,
@@ -89,57 +413,80 @@ class FileOperations:
                                min_size_bytes: int = 0, 
                                max_size_bytes: int = float('inf')) -> Dict[str, List[str]]:
         """Get preview of how files will be organized"""
-        preview = {}
-        
+        key = self._plan_key(folder, custom_tags, organize_by_date, skip_hidden,
+                             manual_assignments, min_size_bytes, max_size_bytes)
         try:
-            files = self.get_files_in_folder(folder, skip_hidden, min_size_bytes, max_size_bytes)
-            
-            for filename in files:
-                if self._cancel_flag:
-                    break
-                    
-                file_path = os.path.join(folder, filename)
-                
-                # Check manual assignment first
-                category = manual_assignments.get(filename)
-                
-                if not category:
-                    custom_category = self.get_custom_tag_category(filename, custom_tags)
-                    if custom_category:
-                        category = custom_category
-                    else:
-                        category = self.get_file_category(filename)
-                
-                # Add date folder if needed
-                if organize_by_date:
-                    date_folder = self.get_date_folder(file_path)
-                    category = f"{category}/{date_folder}"
-                
-                if category not in preview:
-                    preview[category] = []
-                preview[category].append(filename)
-                
+            plan = self._plan_organization(folder, custom_tags, organize_by_date, skip_hidden,
+                                           manual_assignments, min_size_bytes, max_size_bytes)
         except Exception as e:
             raise Exception(f"Error previewing files: {str(e)}")
         
-        return preview
+        # Kept so organizing right after the preview doesn't walk the folder a second time
+        if key is not None and not self._cancel_event.is_set():
+            self._preview_plan = (key, plan)
+        return self._preview_from_plan(plan)
+    
+    def _plan_key(self, folder: str, custom_tags: List[str], organize_by_date: bool,
+                  skip_hidden: bool, manual_assignments: Dict[str, str],
+                  min_size_bytes: int, max_size_bytes: int) -> Optional[Tuple]:
+        """Everything a plan depends on, or None if the plan can't be reused"""
+        # File sizes and dates can change in place without bumping the folder's mtime
+        if organize_by_date or self._size_filtered(min_size_bytes, max_size_bytes):
+            return None
+        # Adding, removing or renaming a file bumps the folder's mtime, which invalidates the key
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+        # The file types editor changes categories in place, so they are part of the key too
+        return (folder, mtime_ns, tuple(custom_tags), organize_by_date, skip_hidden,
+                frozenset(manual_assignments.items()), min_size_bytes, max_size_bytes,
+                tuple((category, tuple(exts)) for category, exts in self.file_types.items()))
+    
+    def _take_preview_plan(self, key: Optional[Tuple]) -> Optional[List[Tuple[str, str]]]:
+        """The last preview's plan if it was made from the same inputs; usable only once"""
+        preview_plan, self._preview_plan = self._preview_plan, None
+        if key is None or preview_plan is None or preview_plan[0] != key:
+            return None
+        return preview_plan[1]
     
     def get_unique_path(self, path: str) -> str:
         """Get unique path if file already exists"""
-        if not os.path.exists(path):
-            return path
+        directory, filename = os.path.split(path)
+        fold = self._fold_name
         
-        directory = os.path.dirname(path)
-        filename = os.path.basename(path)
-        name, ext = os.path.splitext(filename)
+        # List each destination once per run; the set is then the only check, with no
+        # exists() probe per file. Listing happens outside the lock so workers don't queue on it
+        existing = self._dir_names.get(directory)
+        if existing is None:
+            try:
+                with os.scandir(directory) as entries:
+                    listing = {fold(entry.name) for entry in entries}
+            except OSError:
+                listing = set()
+            with self._dir_names_lock:
+                existing = self._dir_names.setdefault(directory, listing)
         
+        name, ext = os.path.splitext(filename)
         counter = 1
-        while os.path.exists(path):
-            new_filename = f"{name}_{counter}{ext}"
-            path = os.path.join(directory, new_filename)
-            counter += 1
+        with self._dir_names_lock:
+            while fold(filename) in existing:
+                filename = f"{name}_{counter}{ext}"
+                counter += 1
+            existing.add(fold(filename))
         
-        return path
+        return os.path.join(directory, filename)
+    
+    # Windows and macOS filesystems are case-insensitive by default, so names are compared casefolded
+    _fold_name = staticmethod(str.casefold if sys.platform in ('win32', 'darwin') else str)
+    
+    @staticmethod
+    def _throttle_ui_callback(callback: Callable, thread_safe_update: Callable,
+                              is_final: Callable = None) -> Optional['Throttler']:
+        """Wrap callback in a Throttler, or None if there is nothing to call"""
+        if not (callback and thread_safe_update):
+            return None
+        return Throttler(callback, thread_safe_update, is_final=is_final)
     
     def organize_files_async(self, folder: str, custom_tags: List[str], 
                         organize_by_date: bool, create_folders: bool,
@@ -149,29 +496,32 @@ class FileOperations:
                         progress_callback: Callable = None, 
                         status_callback: Callable = None,
                         completion_callback: Callable = None,
-                        thread_safe_update: Callable = None) -> None:
+                        thread_safe_update: Callable = None,
+                        folder_stat: Optional[os.stat_result] = None) -> Future:
         """
-        Organize files asynchronously in a background thread
+        Organize files asynchronously on the background operation thread
         """
+        # Reset before submitting so a cancel issued before the worker starts still counts
+        self.reset_cancel_flag()
+        
         def organize_worker():
             try:
-                self.reset_cancel_flag()
                 result = self.organize_files(
                     folder, custom_tags, organize_by_date, create_folders,
                     move_files, skip_hidden, manual_assignments,
                     min_size_bytes, max_size_bytes,
-                    lambda current, total: thread_safe_update(0, lambda: progress_callback(current, total)) if progress_callback and thread_safe_update else None,
-                    lambda msg: thread_safe_update(0, lambda: status_callback(msg)) if status_callback and thread_safe_update else None
+                    self._throttle_ui_callback(progress_callback, thread_safe_update,
+                                               is_final=lambda current, total: current == total),
+                    self._throttle_ui_callback(status_callback, thread_safe_update),
+                    folder_stat
                 )
                 if completion_callback and thread_safe_update:
                     thread_safe_update(0, lambda: completion_callback(result, None))
             except Exception as e:
                 if completion_callback and thread_safe_update:
-                    thread_safe_update(0, lambda: completion_callback(None, e))
-    
-        thread = threading.Thread(target=organize_worker, daemon=True)
-        thread.start()
-        return thread
+                    thread_safe_update(0, lambda error=e: completion_callback(None, error))
+        
+        return self._operation_pool.submit(organize_worker)
     
     def organize_files(self, folder: str, custom_tags: List[str], 
                       organize_by_date: bool, create_folders: bool,
@@ -179,107 +529,198 @@ class FileOperations:
                       manual_assignments: Dict[str, str],
                       min_size_bytes: int = 0, max_size_bytes: int = float('inf'),
                       progress_callback: Callable = None, 
-                      status_callback: Callable = None) -> Tuple[int, List[str], List[Tuple]]:
+                      status_callback: Callable = None,
+                      folder_stat: Optional[os.stat_result] = None) -> Tuple[int, List[str], List[Tuple]]:
+        """
+        Organize files in the specified folder, reusing folder_stat if the caller already has it
+        and the plan of a preview made from the same settings on the unchanged folder
+        Returns: (organized_count, errors, undo_operations)
+        """
+        try:
+            plan = self._take_preview_plan(self._plan_key(
+                folder, custom_tags, organize_by_date, skip_hidden,
+                manual_assignments, min_size_bytes, max_size_bytes))
+            if plan is None:
+                plan = self._plan_organization(folder, custom_tags, organize_by_date, skip_hidden,
+                                               manual_assignments, min_size_bytes, max_size_bytes)
+        except Exception as e:
+            raise Exception(f"Error organizing files: {str(e)}")
+        
+        return self._execute_plan(folder, plan, create_folders, move_files,
+                                  progress_callback, status_callback, folder_stat)
+    
+    def _execute_plan(self, folder: str, plan: List[Tuple[str, str]],
+                      create_folders: bool, move_files: bool,
+                      progress_callback: Callable = None,
+                      status_callback: Callable = None,
+                      folder_stat: Optional[os.stat_result] = None) -> Tuple[int, List[str], List[Tuple]]:
         """
-        Organize files in the specified folder
+        Move or copy files according to an already resolved plan
         Returns: (organized_count, errors, undo_operations)
         """
         undo_operations = []
         errors = []
         organized = 0
+        self._dir_names = {}
         
         try:
-            files = self.get_files_in_folder(folder, skip_hidden, min_size_bytes, max_size_bytes)
-            total_files = len(files)
+            total_files = len(plan)
             
-            # Use ThreadPoolExecutor for parallel processing of file operations
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                future_to_file = {}
-                
-                for i, filename in enumerate(files):
-                    if self._cancel_flag:
-                        break
-                        
-                    file_path = os.path.join(folder, filename)
-                    
+            # Resolve every destination up front so each folder is created only once
+            if create_folders:
+                dest_folders = [os.path.normpath(os.path.join(folder, category))
+                                for _, category in plan]
+            else:
+                dest_folders = [folder] * total_files
+            
+            # Same-device destinations can take a single rename instead of shutil.move
+            folder_dev = (folder_stat or os.stat(folder)).st_dev
+            same_device = {}
+            for dest_folder in set(dest_folders):
+                try:
+                    if create_folders:
+                        try:
+                            os.makedirs(dest_folder)
+                            # Freshly created, so get_unique_path has nothing to list
+                            self._dir_names[dest_folder] = set()
+                        except FileExistsError:
+                            pass
+                    same_device[dest_folder] = os.stat(dest_folder).st_dev == folder_dev
+                except OSError:
+                    same_device[dest_folder] = False  # Reported per file when the move/copy fails
+            
+            # Join paths by plain concatenation in the per-file loop; os.path.join
+            # runs once per folder to get the separator handling right
+            source_prefix = os.path.join(folder, '')
+            dest_prefixes = {dest_folder: os.path.join(dest_folder, '') for dest_folder in same_device}
+            
+            def process(item):
+                filename, dest_folder = item
+                return self._process_single_file(
+                    source_prefix + filename, dest_prefixes[dest_folder] + filename,
+                    move_files, same_device[dest_folder]
+                )
+            
+            # Same-device moves are cheap renames and worker threads only add dispatch
+            # overhead; copies and cross-device moves transfer real data and still
+            # benefit from overlapping I/O
+            is_cancelled = self._cancel_event.is_set
+            items = ((filename, dest_folder)
+                     for (filename, _), dest_folder in zip(plan, dest_folders))
+            if move_files and all(same_device.values()):
+                results = ((item, process(item)) for item in items if not is_cancelled())
+            else:
+                results = self._run_bounded(process, items)
+            
+            try:
+                # Once cancelled no new files are started, but results that are already
+                # in flight are still recorded so they can be undone
+                for i, ((filename, _), result) in enumerate(results):
                     # Update progress
-                    if progress_callback:
-                        progress_callback(i + 1, total_files)
-                    if status_callback:
-                        status_callback(f"Processing: {filename}")
+                    if not is_cancelled():
+                        if progress_callback:
+                            progress_callback(i + 1, total_files)
+                        if status_callback:
+                            status_callback(f"Processing: {filename}")
                     
-                    # Submit file processing to thread pool
-                    future = executor.submit(
-                        self._process_single_file,
-                        file_path, filename, folder, custom_tags,
-                        organize_by_date, create_folders, move_files,
-                        manual_assignments
-                    )
-                    future_to_file[future] = filename
-                
-                # Collect results
-                for future in as_completed(future_to_file):
-                    if self._cancel_flag:
-                        break
-                        
-                    filename = future_to_file[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            operation, success = result
-                            if success:
-                                undo_operations.append(operation)
-                                organized += 1
-                            else:
-                                errors.append(f"{filename}: Operation failed")
-                    except Exception as e:
-                        errors.append(f"{filename}: {str(e)}")
+                    if result:
+                        operation, success = result
+                        if success:
+                            undo_operations.append(operation)
+                            organized += 1
+                        else:
+                            errors.append(f"{filename}: Operation failed")
+            finally:
+                # Stops the workers and waits for them to exit
+                results.close()
                         
         except Exception as e:
             raise Exception(f"Error organizing files: {str(e)}")
+        finally:
+            self._dir_names = {}
+            # Files were moved or copied; the folder mtime may be too coarse to notice
+            self.clear_scan_cache()
         
         return organized, errors, undo_operations
     
-    def _process_single_file(self, file_path: str, filename: str, folder: str,
-                           custom_tags: List[str], organize_by_date: bool,
-                           create_folders: bool, move_files: bool,
-                           manual_assignments: Dict[str, str]) -> Optional[Tuple[Tuple, bool]]:
-        """Process a single file for organization"""
+    def _run_bounded(self, func: Callable, items: Iterable, workers: Optional[int] = None,
+                     queue_size: int = 256) -> Iterator[Tuple]:
+        """
+        Run func over items on worker threads (COPY_WORKERS by default) fed through a bounded queue
+        Yields: (item, result) in completion order
+        """
+        workers = workers or self.COPY_WORKERS
+        tasks = queue.Queue(maxsize=queue_size)
+        results = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        is_cancelled = self._cancel_event.is_set
+        done = object()  # Sentinel marking the end of the work
+        
+        def producer():
+            for item in items:
+                # Keep retrying so a stopped run never blocks on a full queue
+                while not stop.is_set():
+                    try:
+                        tasks.put(item, timeout=0.05)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    break
+            for _ in range(workers):
+                tasks.put(done)
+        
+        def worker():
+            while True:
+                item = tasks.get()
+                if item is done:
+                    results.put(done)
+                    return
+                # Drain remaining items without processing once stopped or cancelled
+                if stop.is_set() or is_cancelled():
+                    continue
+                try:
+                    result = func(item)
+                except Exception:
+                    result = None  # Keep the worker alive so the run can finish
+                results.put((item, result))
+        
+        threads = [threading.Thread(target=producer, daemon=True)]
+        threads += [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        
+        finished = 0
         try:
-            # Check manual assignment first
-            category = manual_assignments.get(filename)
-            
-            if not category:
-                # Determine category
-                custom_category = self.get_custom_tag_category(filename, custom_tags)
-                if custom_category:
-                    category = custom_category
+            while finished < workers:
+                result = results.get()
+                if result is done:
+                    finished += 1
                 else:
-                    category = self.get_file_category(filename)
-            
-            # Create destination path
-            if create_folders:
-                if organize_by_date:
-                    date_folder = self.get_date_folder(file_path)
-                    dest_folder = os.path.join(folder, category, date_folder)
-                else:
-                    dest_folder = os.path.join(folder, category)
-                
-                os.makedirs(dest_folder, exist_ok=True)
-                dest_path = os.path.join(dest_folder, filename)
-            else:
-                dest_path = os.path.join(folder, filename)
-            
+                    yield result
+        finally:
+            # Unblock any worker waiting on a full results queue before joining
+            stop.set()
+            while finished < workers:
+                if results.get() is done:
+                    finished += 1
+            for thread in threads:
+                thread.join()
+    
+    def _process_single_file(self, file_path: str, dest_path: str,
+                           move_files: bool, same_device: bool = False) -> Optional[Tuple[Tuple, bool]]:
+        """Process a single file for organization"""
+        try:
             # Handle duplicate names
             dest_path = self.get_unique_path(dest_path)
             
             # Move or copy file
             if file_path != dest_path:
                 if move_files:
-                    shutil.move(file_path, dest_path)
+                    self._move_file(file_path, dest_path, same_device)
                     operation = ('move', file_path, dest_path)
                 else:
-                    shutil.copy2(file_path, dest_path)
+                    self._copy_file(file_path, dest_path, same_device)
                     operation = ('copy', file_path, dest_path)
                 
                 return operation, True
@@ -289,26 +730,109 @@ class FileOperations:
         
         return None, True
     
+    def _move_file(self, source: str, destination: str, same_device: bool = True) -> None:
+        """Move a file with a single rename, copying only when it has to cross devices"""
+        if same_device:
+            try:
+                # Replaces an existing destination file, as shutil.move would
+                os.replace(source, destination)
+                return
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Same st_dev but still a different mount (e.g. a bind mount)
+        shutil.move(source, destination)
+    
+    def _copy_file(self, source: str, destination: str, same_device: bool = False) -> None:
+        """Copy a file with metadata using the cheapest mechanism available"""
+        if same_device and self.hardlink_copies:
+            try:
+                os.link(source, destination)
+                return
+            except OSError:
+                pass  # Filesystem without hard link support, fall back to copying
+        
+        if hasattr(os, 'copy_file_range'):
+            # In-kernel copy on Linux; btrfs and XFS can reflink instead of copying data
+            try:
+                with open(source, 'rb') as fsrc, open(destination, 'wb') as fdst:
+                    while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                        pass
+                shutil.copystat(source, destination)
+                return
+            except OSError:
+                pass  # Unsupported by the kernel or filesystem, copy2 overwrites any partial file
+        
+        shutil.copy2(source, destination)
+    
     def undo_operations_async(self, operations: List[Tuple],
                             status_callback: Callable = None,
                             completion_callback: Callable = None,
-                            thread_safe_update: Callable = None) -> threading.Thread:
+                            thread_safe_update: Callable = None) -> Future:
         """Undo operations asynchronously"""
+        # A cancelled organize must not leave undo cancelled before it starts
+        self.reset_cancel_flag()
+        
         def undo_worker():
             try:
                 result = self.undo_operations(
                     operations,
-                    lambda msg: thread_safe_update(0, lambda: status_callback(msg)) if status_callback and thread_safe_update else None
+                    self._throttle_ui_callback(status_callback, thread_safe_update)
                 )
                 if completion_callback and thread_safe_update:
                     thread_safe_update(0, lambda: completion_callback(result, None))
             except Exception as e:
                 if completion_callback and thread_safe_update:
-                    thread_safe_update(0, lambda: completion_callback(None, e))
-
-        thread = threading.Thread(target=undo_worker, daemon=True)
-        thread.start()
-        return thread
+                    thread_safe_update(0, lambda error=e: completion_callback(None, error))
+        
+        return self._operation_pool.submit(undo_worker)
+    
+    def remove_tree(self, folder: str, force: bool = False, workers: int = 16) -> None:
+        """
+        Delete a folder and everything in it, unlinking files on worker threads
+        force makes read-only entries writable and retries instead of failing on them
+        """
+        def remove(func, path):
+            try:
+                func(path)
+            except OSError:
+                if not force:
+                    raise
+                os.chmod(path, stat.S_IWRITE)
+                func(path)
+        
+        # A linked folder is removed as the link itself, never by emptying its target
+        if self._is_link(os.lstat(folder)):
+            remove(os.unlink, folder)
+            return
+        
+        # Walk top-down with scandir, unlinking files as they are found; symlinks and
+        # junctions are removed, never followed
+        dirs = [folder]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='file-rm') as pool:
+            futures = []
+            for dir_path in dirs:  # Grows while iterating
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and not (
+                                os.name == 'nt' and self._is_link(entry.stat(follow_symlinks=False))):
+                            dirs.append(entry.path)
+                        else:
+                            futures.append(pool.submit(remove, os.unlink, entry.path))
+            for future in futures:
+                future.result()  # Re-raise the first failure
+        
+        # Children were appended after their parents, so reversed order is bottom-up
+        for dir_path in reversed(dirs):
+            remove(os.rmdir, dir_path)
+    
+    @staticmethod
+    def _is_link(st: os.stat_result) -> bool:
+        """Check an lstat result for a symlink or, on Windows, any reparse point such as a junction"""
+        # Junctions report as plain directories to is_dir(follow_symlinks=False); like
+        # shutil.rmtree, treat them as links so a delete never walks into their target
+        return (stat.S_ISLNK(st.st_mode)
+                or bool(getattr(st, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT))
     
     def undo_operations(self, operations: List[Tuple], 
                     status_callback: Callable = None) -> Tuple[int, List[str]]:
@@ -323,7 +847,7 @@ class FileOperations:
         
         # First pass: undo file operations
         for operation_type, source, destination in reversed(operations):
-            if self._cancel_flag:
+            if self._cancel_event.is_set():
                 break
                 
             try:
@@ -332,7 +856,7 @@ class FileOperations:
                 
                 if operation_type == 'move':
                     if os.path.exists(destination):
-                        shutil.move(destination, source)
+                        self._move_file(destination, source)
                         undone += 1
                         # Track the folder that contained the moved file
                         folders_to_check.add(os.path.dirname(destination))
@@ -362,7 +886,7 @@ class FileOperations:
             
             try:
                 # First try normal removal
-                if os.path.exists(folder_path) and not os.listdir(folder_path):
+                if is_folder_truly_empty(folder_path):
                     os.rmdir(folder_path)
                     return True
             except OSError:
@@ -372,13 +896,7 @@ class FileOperations:
                 # If normal removal fails, try force removal
                 if os.path.exists(folder_path):
                     # Check if folder is actually empty (including hidden files)
-                    all_items = []
-                    try:
-                        all_items = os.listdir(folder_path)
-                    except Exception:
-                        pass
-                    
-                    if not all_items:  # Folder is truly empty
+                    if is_folder_truly_empty(folder_path):
                         # Try to remove with force handling
                         shutil.rmtree(folder_path, onerror=handle_remove_readonly)
                         return True
@@ -393,50 +911,46 @@ class FileOperations:
         def is_folder_truly_empty(folder_path):
             """Check if folder is truly empty, including hidden files"""
             try:
-                items = os.listdir(folder_path)
-                return len(items) == 0
+                # Reading a single entry is enough to know the folder isn't empty
+                with os.scandir(folder_path) as entries:
+                    return next(entries, None) is None
             except Exception:
                 return False
         
-        # Sort folders by depth (deepest first) for proper removal order
-        sorted_folders = sorted(folders_to_check, key=lambda x: x.count(os.sep), reverse=True)
+        # Process folders deepest first so every parent is checked once, after its children
+        pending = [(-folder.count(os.sep), folder) for folder in folders_to_check]
+        heapq.heapify(pending)
+        queued = set(folders_to_check)
         
-        for folder in sorted_folders:
-            if self._cancel_flag:
+        while pending:
+            if self._cancel_event.is_set():
                 break
+            
+            _, folder = heapq.heappop(pending)
                 
             try:
                 if status_callback:
                     status_callback(f"Checking folder: {os.path.basename(folder)}")
                 
-                # Walk up the directory tree to check for empty folders
-                current_folder = folder
-                max_attempts = 10  # Prevent infinite loops
-                attempts = 0
+                # Skip if we reached the filesystem root
+                parent_folder = os.path.dirname(folder)
+                if parent_folder == folder:
+                    continue
                 
-                while current_folder and os.path.exists(current_folder) and attempts < max_attempts:
-                    attempts += 1
-                    
-                    # Skip if this is the root folder being organized
-                    parent_of_current = os.path.dirname(current_folder)
-                    if parent_of_current == current_folder:  # Reached root
-                        break
-                    
-                    # Check if folder is empty
-                    if not is_folder_truly_empty(current_folder):
-                        break
-                    
-                    # Try to remove the empty folder
-                    if force_remove_folder(current_folder):
-                        removed_folders.append(current_folder)
-                        if status_callback:
-                            status_callback(f"Removed empty folder: {os.path.basename(current_folder)}")
-                    else:
-                        # If we can't remove this folder, don't try parent folders
-                        break
+                # Check if folder is empty
+                if not is_folder_truly_empty(folder):
+                    continue
+                
+                # Try to remove the empty folder
+                if force_remove_folder(folder):
+                    removed_folders.append(folder)
+                    if status_callback:
+                        status_callback(f"Removed empty folder: {os.path.basename(folder)}")
                     
-                    # Move up to parent directory
-                    current_folder = parent_of_current
+                    # The parent might have become empty too
+                    if parent_folder not in queued:
+                        queued.add(parent_folder)
+                        heapq.heappush(pending, (-parent_folder.count(os.sep), parent_folder))
                     
                     # Small delay to allow Windows to release folder locks
                     time.sleep(0.1)
@@ -447,6 +961,7 @@ class FileOperations:
                 # Continue with other folders even if one fails
                 continue
         
+        self.clear_scan_cache()
         return undone, errors, removed_folders
 
     def cleanup_empty_folders(self, folder: str, status_callback: Callable = None) -> Tuple[int, List[str]]:
@@ -472,9 +987,8 @@ class FileOperations:
                         pass
             
             try:
-                if os.path.exists(folder_path) and not os.listdir(folder_path):
-                    os.rmdir(folder_path)
-                    return True
+                os.rmdir(folder_path)  # Fails on its own if the folder is gone or not empty
+                return True
             except OSError:
                 pass
             
@@ -495,19 +1009,9 @@ class FileOperations:
             return False
         
         try:
-            # Find all subdirectories
-            all_dirs = []
-            for root, dirs, files in os.walk(folder):
-                for d in dirs:
-                    dir_path = os.path.join(root, d)
-                    all_dirs.append(dir_path)
-            
-            # Sort by depth (deepest first)
-            all_dirs.sort(key=lambda x: x.count(os.sep), reverse=True)
-            
-            # Try to remove empty directories
-            for dir_path in all_dirs:
-                if self._cancel_flag:
+            # Subfolders come deepest first, so a parent is checked after its emptied children
+            for dir_path in self._iter_subfolders_deepest_first(folder):
+                if self._cancel_event.is_set():
                     break
                     
                 try:
@@ -515,16 +1019,14 @@ class FileOperations:
                         status_callback(f"Checking: {os.path.basename(dir_path)}")
                     
                     # Check if directory is empty
-                    if os.path.exists(dir_path):
-                        items = os.listdir(dir_path)
-                        if not items:  # Empty directory
-                            if force_remove_folder(dir_path):
-                                removed_count += 1
-                                if status_callback:
-                                    status_callback(f"Removed: {os.path.basename(dir_path)}")
-                            
-                            # Small delay for Windows
-                            time.sleep(0.05)
+                    if self._is_empty_folder(dir_path):
+                        if force_remove_folder(dir_path):
+                            removed_count += 1
+                            if status_callback:
+                                status_callback(f"Removed: {os.path.basename(dir_path)}")
+                        
+                        # Small delay for Windows
+                        time.sleep(0.05)
                             
                 except Exception as e:
                     errors.append(f"Error with {os.path.basename(dir_path)}: {str(e)}")
@@ -534,6 +1036,27 @@ class FileOperations:
         
         return removed_count, errors
     
+    def _iter_subfolders_deepest_first(self, folder: str) -> Iterator[str]:
+        """Yield every subfolder below folder after its own subfolders, without following symlinks"""
+        try:
+            with os.scandir(folder) as entries:
+                subfolders = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        
+        for path in subfolders:
+            yield from self._iter_subfolders_deepest_first(path)
+            yield path
+    
+    @staticmethod
+    def _is_empty_folder(folder: str) -> bool:
+        """Check for an empty folder, reading at most one entry of its listing"""
+        try:
+            with os.scandir(folder) as entries:
+                return next(entries, None) is None
+        except OSError:
+            return False
+    
     def check_folder_permissions(self, folder: str) -> bool:
         """Check if folder has write permissions"""
         return os.access(folder, os.W_OK)
@@ -552,33 +1075,47 @@ class FileOperations:
             }
         }
         
+        sizes = []
+        
         try:
-            files = [f for f in os.listdir(folder) 
-                    if os.path.isfile(os.path.join(folder, f))]
-            
-            if skip_hidden:
-                files = [f for f in files if not f.startswith('.')]
-            
-            for filename in files:
-                file_path = os.path.join(folder, filename)
-                file_size = self.get_file_size(file_path)
-                
-                stats['total_files'] += 1
-                stats['total_size'] += file_size
-                
-                # Categorize by size
-                if file_size < 1024:  # < 1KB
-                    stats['size_ranges']['tiny'] += 1
-                elif file_size < 1024 * 1024:  # < 1MB
-                    stats['size_ranges']['small'] += 1
-                elif file_size < 100 * 1024 * 1024:  # < 100MB
-                    stats['size_ranges']['medium'] += 1
-                elif file_size < 1024 * 1024 * 1024:  # < 1GB
-                    stats['size_ranges']['large'] += 1
-                else:  # >= 1GB
-                    stats['size_ranges']['huge'] += 1
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    # Name check first: it never needs a syscall, unlike is_file() on symlinks
+                    if skip_hidden and entry.name.startswith('.'):
+                        continue
+                    if not entry.is_file():
+                        continue
                     
+                    try:
+                        sizes.append(entry.stat().st_size)
+                    except OSError:
+                        sizes.append(0)
+                
         except Exception:
             pass
         
+        stats['total_files'] = len(sizes)
+        size_ranges = stats['size_ranges']
+        
+        if np is not None and len(sizes) >= self.VECTORIZE_MIN_FILES:
+            # Classify every size in one vectorized pass
+            size_array = np.fromiter(sizes, dtype=np.int64, count=len(sizes))
+            stats['total_size'] = int(size_array.sum())
+            if _bucket_sizes is not None:
+                # Single compiled pass, no intermediate bucket-index array
+                counts = _bucket_sizes(size_array, np.array(self.SIZE_THRESHOLDS, dtype=np.int64))
+            else:
+                buckets = np.searchsorted(self.SIZE_THRESHOLDS, size_array, side='right')
+                counts = np.bincount(buckets, minlength=len(self.SIZE_RANGES))
+            for name, count in zip(self.SIZE_RANGES, counts.tolist()):
+                size_ranges[name] = count
+        else:
+            stats['total_size'] = sum(sizes)
+            thresholds = self.SIZE_THRESHOLDS
+            bucket_names = self.SIZE_RANGES
+            
+            # Categorize by size
+            for file_size in sizes:
+                size_ranges[bucket_names[bisect_right(thresholds, file_size)]] += 1
+        
         return stats
\ No newline at end of file
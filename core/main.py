@@ -1,20 +1,40 @@
+import functools
 import os
+import stat
 import sys
 import threading
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from types import MappingProxyType
+from typing import Dict, List, Tuple
 from tkinter import messagebox
-import customtkinter as ctk
 
-# Add project root to sys.path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Running core/main.py directly (as README and build.bat do) puts core/ on sys.path
+# instead of the project root; imported as core.main the packages already resolve
+if not __package__ and PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
     
 from config.config_manager import ConfigManager
 from core.file_operations import FileOperations
 from ui.main_window import MainWindow
-from features.smart_features import SmartFeatures
-from features.security_performance import SecurityPerformance
+
+# Bytes per size unit offered in the size filter
+SIZE_MULTIPLIERS = MappingProxyType({'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3})
+
+def _ui_errors(message: str):
+    """Report exceptions escaping a UI action in an error dialog and the status bar"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except Exception as e:
+                messagebox.showerror("Error", f"{message}: {str(e)}")
+                self.main_window.set_status(message)
+        return wrapper
+    return decorator
 
 class FileOrganizer:
     """Main File Organizer application controller"""
@@ -24,14 +44,17 @@ class FileOrganizer:
         self.config_manager = ConfigManager()
         self.config = self.config_manager.load_config()
         self.file_ops = FileOperations(self.config['file_types'])
-        self.smart_features = SmartFeatures()
-        self.security_perf = SecurityPerformance()
         
         # Operation state
         self.current_operation_thread = None
         self.operation_in_progress = False
         self.undo_operations = []
         self.manual_assignments = self.config.get('manual_assignments', {})
+        self._file_count_job = None  # Pending debounced file count refresh
+        self._file_count_request = 0  # Id of the latest file count scan
+        self._custom_tags_cache = ('', ())  # (raw setting, parsed tags)
+        self._io_pool = ThreadPoolExecutor(max_workers=1)  # Quick folder scans off the UI thread
+        self._scan_pool = ThreadPoolExecutor(max_workers=1)  # Content scans that read every file
         
         # Initialize UI
         self.main_window = MainWindow(self)
@@ -39,6 +62,24 @@ class FileOrganizer:
         # Load saved settings
         self._load_settings()
     
+    @cached_property
+    def smart_features(self):
+        """Duplicate detection and suggestions, imported on first use"""
+        from features.smart_features import SmartFeatures
+        return SmartFeatures()
+    
+    @cached_property
+    def hash_cache(self):
+        """Duplicate finder digests kept on disk, reused while files are unchanged"""
+        from features.hash_cache import HashCache
+        return HashCache(algo=self.smart_features.DIGEST_ALGO)
+    
+    @cached_property
+    def security_perf(self):
+        """Secure delete and integrity helpers, imported on first use"""
+        from features.security_performance import SecurityPerformance
+        return SecurityPerformance()
+    
     def _load_settings(self):
         """Load settings from configuration"""
         settings = {
@@ -62,17 +103,35 @@ class FileOrganizer:
         self.config['manual_assignments'] = self.manual_assignments
         self.config_manager.save_config(self.config)
     
-    def _convert_size_to_bytes(self, size_str: str, unit: str, is_max: bool = False) -> int:
+    def convert_size_to_bytes(self, size_str: str, unit: str, is_max: bool = False) -> int:
         """Convert size string to bytes"""
-        if not size_str or not size_str.strip():
-            return 0 if not is_max else float('inf')
+        size_str = size_str.strip() if size_str else ''
+        if not size_str:
+            return 0 if not is_max else sys.maxsize
         
         try:
-            size = float(size_str)
-            multipliers = {'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3}
-            return int(size * multipliers.get(unit, 1))
+            return int(float(size_str) * SIZE_MULTIPLIERS.get(unit, 1))
         except ValueError:
-            return 0 if not is_max else float('inf')
+            return 0 if not is_max else sys.maxsize
+    
+    def _parse_tags(self, raw_tags: str) -> Tuple[str, ...]:
+        """Split the comma separated custom tags, reusing the last result if unchanged"""
+        if raw_tags == self._custom_tags_cache[0]:
+            return self._custom_tags_cache[1]
+        
+        tags = tuple(tag for tag in (part.strip() for part in raw_tags.split(",")) if tag)
+        self._custom_tags_cache = (raw_tags, tags)
+        return tags
+    
+    def _collect_filter_params(self) -> Tuple[Dict, Tuple[str, ...], int, int]:
+        """
+        Read the current settings once and parse the filters they define
+        Returns: (settings, custom_tags, min_size_bytes, max_size_bytes)
+        """
+        settings = self.main_window.get_current_settings()
+        custom_tags = self._parse_tags(settings['custom_tags'])
+        # The window keeps the size fields parsed, the unit selector applies to both
+        return settings, custom_tags, self.main_window.min_size_bytes, self.main_window.max_size_bytes
     
     # =============================================================================
     # File Operations
@@ -84,23 +143,52 @@ class FileOrganizer:
         if folder:
             self.update_file_count(folder)
     
-    def update_file_count(self, folder: str):
+    def update_file_count(self, folder: str, delay_ms: int = 200):
+        """Schedule a file count refresh, coalescing calls made in quick succession"""
+        if self._file_count_job:
+            self.main_window.root.after_cancel(self._file_count_job)
+        self._file_count_job = self.main_window.root.after(
+            delay_ms, lambda: self._do_update_file_count(folder)
+        )
+    
+    def _do_update_file_count(self, folder: str):
         """Update file count display"""
+        self._file_count_job = None
+        # Newer requests supersede scans still running for an older folder or filter
+        self._file_count_request += 1
+        request_id = self._file_count_request
+        
+        def show(message):
+            if request_id == self._file_count_request:
+                self.main_window.set_file_count(message)
+        
         if not folder or not os.path.isdir(folder):
             self.main_window.set_file_count("Select a folder to see file count")
             return
             
         try:
-            settings = self.main_window.get_current_settings()
-            min_size = self._convert_size_to_bytes(settings['min_size'], 'min')
-            max_size = self._convert_size_to_bytes(settings['max_size'], settings['size_unit'], True)
+            settings, _, min_size, max_size = self._collect_filter_params()
             
-            files = self.file_ops.get_files_in_folder(
-                folder, settings['skip_hidden'], min_size, max_size
+            def show_progress(count):
+                self._run_on_ui(lambda: show(f"Counting files... {count}"))
+            
+            # Streams the folder, so only the count is held in memory
+            future = self._io_pool.submit(
+                self.file_ops.count_files_in_folder,
+                folder, settings['skip_hidden'], min_size, max_size, show_progress
             )
-            self.main_window.set_file_count(f"Found {len(files)} files to organize")
         except Exception:
             self.main_window.set_file_count("Error reading folder")
+            return
+        
+        def show_count(future):
+            try:
+                message = f"Found {future.result()} files to organize"
+            except Exception:
+                message = "Error reading folder"
+            self._run_on_ui(lambda: show(message))
+        
+        future.add_done_callback(show_count)
     
     def get_folder_statistics(self):
         """Show folder statistics"""
@@ -109,13 +197,30 @@ class FileOrganizer:
             messagebox.showwarning("Warning", "Please select a valid folder first.")
             return
         
+        settings = self.main_window.get_current_settings()
+        future = self._io_pool.submit(
+            self.file_ops.get_folder_statistics, folder, settings['skip_hidden']
+        )
+        
+        def show_statistics(future):
+            try:
+                stats = future.result()
+            except Exception as e:
+                message = f"Error getting folder statistics: {str(e)}"
+                self._run_on_ui(lambda: messagebox.showerror("Error", message))
+                return
+            self._run_on_ui(lambda: self.main_window.show_folder_statistics(stats))
+        
+        future.add_done_callback(show_statistics)
+    
+    def _run_on_ui(self, callback):
+        """Schedule callback on the Tk event loop from a worker thread"""
         try:
-            settings = self.main_window.get_current_settings()
-            stats = self.file_ops.get_folder_statistics(folder, settings['skip_hidden'])
-            self.main_window.show_folder_statistics(stats)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error getting folder statistics: {str(e)}")
+            self.main_window.root.after(0, callback)
+        except Exception:
+            pass  # Window already closed
     
+    @_ui_errors("Error previewing organization")
     def preview_organization(self):
         """Preview file organization"""
         folder = self.main_window.get_selected_folder()
@@ -123,28 +228,21 @@ class FileOrganizer:
             messagebox.showwarning("Warning", "Please select a valid folder first.")
             return
         
-        try:
-            settings = self.main_window.get_current_settings()
-            custom_tags = [tag.strip() for tag in settings['custom_tags'].split(",") if tag.strip()]
-            
-            min_size = self._convert_size_to_bytes(settings['min_size'], 'min')
-            max_size = self._convert_size_to_bytes(settings['max_size'], settings['size_unit'], True)
-            
-            preview_data = self.file_ops.get_organization_preview(
-                folder, custom_tags, settings['organize_by_date'],
-                settings['skip_hidden'], self.manual_assignments,
-                min_size, max_size
-            )
-            
-            if not preview_data:
-                messagebox.showinfo("Preview", "No files found to organize with current filters.")
-                return
-            
-            self.main_window.show_preview(preview_data)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error previewing organization: {str(e)}")
+        settings, custom_tags, min_size, max_size = self._collect_filter_params()
+        
+        preview_data = self.file_ops.get_organization_preview(
+            folder, custom_tags, settings['organize_by_date'],
+            settings['skip_hidden'], self.manual_assignments,
+            min_size, max_size
+        )
+        
+        if not preview_data:
+            messagebox.showinfo("Preview", "No files found to organize with current filters.")
+            return
+        
+        self.main_window.show_preview(preview_data)
     
+    @_ui_errors("Error starting organization")
     def organize_files(self):
         """Organize files asynchronously"""
         if self.operation_in_progress:
@@ -152,7 +250,12 @@ class FileOrganizer:
             return
         
         folder = self.main_window.get_selected_folder()
-        if not folder or not os.path.isdir(folder):
+        # One stat answers "is it a folder" here and gives the worker the folder's device
+        try:
+            folder_stat = os.stat(folder) if folder else None
+        except OSError:
+            folder_stat = None
+        if folder_stat is None or not stat.S_ISDIR(folder_stat.st_mode):
             messagebox.showwarning("Warning", "Please select a valid folder first.")
             return
         
@@ -164,11 +267,7 @@ class FileOrganizer:
             return
         
         try:
-            settings = self.main_window.get_current_settings()
-            custom_tags = [tag.strip() for tag in settings['custom_tags'].split(",") if tag.strip()]
-            
-            min_size = self._convert_size_to_bytes(settings['min_size'], 'min')
-            max_size = self._convert_size_to_bytes(settings['max_size'], settings['size_unit'], True)
+            settings, custom_tags, min_size, max_size = self._collect_filter_params()
             
             self._start_operation()
             
@@ -197,12 +296,13 @@ class FileOrganizer:
                 self.main_window.update_progress,
                 self.main_window.set_status,
                 completion_callback,
-                self.main_window.root.after
+                self.main_window.root.after,
+                folder_stat
             )
             
-        except Exception as e:
+        except Exception:
             self._end_operation()
-            messagebox.showerror("Error", f"Error starting organization: {str(e)}")
+            raise
     
     def _show_organization_results(self, organized: int, errors: List[str]):
         """Show organization results"""
@@ -216,6 +316,7 @@ class FileOrganizer:
         messagebox.showinfo("Complete", message)
         self.main_window.set_status("Organization complete!")
     
+    @_ui_errors("Error starting undo")
     def undo_last_operation(self):
         """Undo the last file organization operation including folder removal"""
         if self.operation_in_progress:
@@ -264,9 +365,9 @@ class FileOrganizer:
                 completion_callback, self.main_window.root.after
             )
                 
-        except Exception as e:
+        except Exception:
             self._end_operation()
-            messagebox.showerror("Error", f"Error starting undo: {str(e)}")
+            raise
     
     def cancel_operation(self):
         """Cancel current operation"""
@@ -291,6 +392,7 @@ class FileOrganizer:
     # Advanced Features
     # =============================================================================
     
+    @_ui_errors("Error finding duplicates")
     def find_duplicates(self):
             """Find and manage duplicate files with improved error handling"""
             if self.operation_in_progress:
@@ -302,12 +404,37 @@ class FileOrganizer:
                 messagebox.showwarning("Warning", "Please select a valid folder first.")
                 return
 
-            try:
-                # Show progress
-                self.main_window.set_status("Scanning for duplicate files...")
-                
-                # Find duplicates
-                duplicates = self.smart_features.find_duplicates(folder)
+            # The scan runs on the scan thread; the window stays responsive and shows the result when done.
+            # Only the busy flag is set: the scan can't be cancelled, so the cancel button stays off
+            self.operation_in_progress = True
+            self.main_window.set_status("Scanning for duplicate files...")
+            settings = self.main_window.get_current_settings()
+            
+            def scan():
+                try:
+                    return self.smart_features.find_duplicates(
+                        folder, skip_hidden=settings['skip_hidden'], hash_cache=self.hash_cache
+                    )
+                finally:
+                    self.hash_cache.flush()
+            
+            def show_result(future):
+                self.operation_in_progress = False
+                try:
+                    duplicates = future.result()
+                except PermissionError:
+                    messagebox.showerror("Permission Error", 
+                        "Cannot access some files in the folder. Please check permissions.")
+                    self.main_window.set_status("Permission error occurred")
+                    return
+                except FileNotFoundError:
+                    messagebox.showerror("Error", "The selected folder no longer exists.")
+                    self.main_window.set_status("Folder not found")
+                    return
+                except Exception as e:
+                    messagebox.showerror("Error", f"Error finding duplicates: {str(e)}")
+                    self.main_window.set_status("Error occurred while finding duplicates")
+                    return
                 
                 if not duplicates:
                     self.main_window.set_status("No duplicate files found")
@@ -322,19 +449,47 @@ class FileOrganizer:
                 
                 # Show duplicates window
                 self.main_window.show_duplicates(duplicates, folder, self.security_perf)
-                
-            except PermissionError:
-                messagebox.showerror("Permission Error", 
-                    "Cannot access some files in the folder. Please check permissions.")
-                self.main_window.set_status("Permission error occurred")
-            except FileNotFoundError:
-                messagebox.showerror("Error", "The selected folder no longer exists.")
-                self.main_window.set_status("Folder not found")
+            
+            future = self._scan_pool.submit(scan)
+            future.add_done_callback(lambda future: self._run_on_ui(lambda: show_result(future)))
+    
+    @_ui_errors("Error finding similar files")
+    def find_similar_files(self):
+        """Find files that share most of their content, on the scan thread"""
+        if self.operation_in_progress:
+            messagebox.showwarning("Warning", "Please wait for current operation to complete.")
+            return
+        
+        folder = self.main_window.get_selected_folder()
+        if not folder or not os.path.isdir(folder):
+            messagebox.showwarning("Warning", "Please select a valid folder first.")
+            return
+        
+        self.operation_in_progress = True
+        self.main_window.set_status("Scanning for similar files...")
+        settings = self.main_window.get_current_settings()
+        future = self._scan_pool.submit(
+            self.smart_features.find_near_duplicates, folder, skip_hidden=settings['skip_hidden']
+        )
+        
+        def show_result(future):
+            self.operation_in_progress = False
+            try:
+                pairs = future.result()
             except Exception as e:
-                error_msg = f"Error finding duplicates: {str(e)}"
-                messagebox.showerror("Error", error_msg)
-                self.main_window.set_status("Error occurred while finding duplicates")
-                print(f"Duplicate finding error: {e}")  # For debugging
+                messagebox.showerror("Error", f"Error finding similar files: {str(e)}")
+                self.main_window.set_status("Error occurred while finding similar files")
+                return
+            
+            if not pairs:
+                self.main_window.set_status("No similar files found")
+                messagebox.showinfo("No Similar Files", "No similar files found in the selected folder!")
+                return
+            
+            self.main_window.set_status(f"Found {len(pairs)} pairs of similar files")
+            self.main_window.show_similar_files(pairs)
+        
+        future.add_done_callback(lambda future: self._run_on_ui(lambda: show_result(future)))
     
     def open_file_types_editor(self):
         """Open file types editor"""
@@ -344,6 +499,7 @@ class FileOrganizer:
         
         self.main_window.show_file_types_editor(self.config['file_types'], save_callback)
     
+    @_ui_errors("Error opening manual assignment window")
     def open_manual_assignment_window(self):
         """Open manual file assignment window"""
         folder = self.main_window.get_selected_folder()
@@ -351,31 +507,25 @@ class FileOrganizer:
             messagebox.showwarning("Warning", "Please select a valid folder first.")
             return
         
-        try:
-            settings = self.main_window.get_current_settings()
-            min_size = self._convert_size_to_bytes(settings['min_size'], 'min')
-            max_size = self._convert_size_to_bytes(settings['max_size'], settings['size_unit'], True)
-            
-            files = self.file_ops.get_files_in_folder(
-                folder, settings['skip_hidden'], min_size, max_size
-            )
-            
-            if not files:
-                messagebox.showinfo("No Files", "No files found in the selected folder with current filters.")
-                return
-            
-            def save_assignments(assignments: Dict[str, str]):
-                self.manual_assignments = assignments
-                self.save_settings()
-                messagebox.showinfo("Saved", "Manual assignments saved successfully!")
-            
-            self.main_window.show_manual_assignment(
-                files, self.config['file_types'], settings['custom_tags'],
-                self.manual_assignments, save_assignments, folder
-            )
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error opening manual assignment window: {str(e)}")
+        settings, _, min_size, max_size = self._collect_filter_params()
+        
+        files = self.file_ops.get_files_in_folder(
+            folder, settings['skip_hidden'], min_size, max_size
+        )
+        
+        if not files:
+            messagebox.showinfo("No Files", "No files found in the selected folder with current filters.")
+            return
+        
+        def save_assignments(assignments: Dict[str, str]):
+            self.manual_assignments = assignments
+            self.save_settings()
+            messagebox.showinfo("Saved", "Manual assignments saved successfully!")
+        
+        self.main_window.show_manual_assignment(
+            files, self.config['file_types'], settings['custom_tags'],
+            self.manual_assignments, save_assignments, folder
+        )
     
     # =============================================================================
     # Application Lifecycle
@@ -400,6 +550,11 @@ class FileOrganizer:
             return
         
         self.save_settings()
+        self._io_pool.shutdown(wait=False)
+        self._scan_pool.shutdown(wait=False, cancel_futures=True)
+        self.file_ops.shutdown()
+        if 'hash_cache' in self.__dict__:
+            self.hash_cache.close()
         self.main_window.root.destroy()
 
 def main():
@@ -0,0 +1,136 @@
+# hash_cache.py
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".config", "file-organizer", "hashcache.sqlite")
+
+class HashCache:
+    """Persistent file digest cache keyed by (path, mtime_ns, size, limit)"""
+    
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, max_entries: int = 100000, algo: str = ""):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.algo = algo  # Digests stored under another algorithm are dropped on open
+        self._conn = None
+        self._lock = threading.Lock()  # Lookups come from the hashing threads
+        self._pending: Dict[Tuple, str] = {}  # New digests, written by flush()
+        self._touched: Set[Tuple[str, int]] = set()  # Rows hit since the last flush()
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use, or None if it can't be opened"""
+        if self._conn is None:
+            try:
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS hashes ("
+                             "path TEXT NOT NULL, head_limit INTEGER NOT NULL, "
+                             "mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+                             "digest TEXT NOT NULL, last_used REAL NOT NULL, "
+                             "PRIMARY KEY (path, head_limit))")
+                conn.execute("CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes (last_used)")
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                
+                # Digests from another algorithm would never match fresh ones
+                row = conn.execute("SELECT value FROM meta WHERE key = 'algo'").fetchone()
+                if row is None or row[0] != self.algo:
+                    with conn:
+                        conn.execute("DELETE FROM hashes")
+                        conn.execute("INSERT OR REPLACE INTO meta VALUES ('algo', ?)", (self.algo,))
+                self._conn = conn
+            except (OSError, sqlite3.Error):
+                self._conn = False  # Work as an in-memory cache for this session
+        return self._conn or None
+    
+    def get(self, key: Tuple, default: Optional[str] = None) -> Optional[str]:
+        """Get the digest for key, or default if the file changed or was never hashed"""
+        path, mtime_ns, size, limit = key
+        with self._lock:
+            digest = self._pending.get(key)
+            if digest is not None:
+                return digest
+            
+            conn = self._connect()
+            if conn is None:
+                return default
+            try:
+                row = conn.execute("SELECT digest FROM hashes WHERE path = ? AND head_limit = ? "
+                                   "AND mtime_ns = ? AND size = ?",
+                                   (path, limit or 0, mtime_ns, size)).fetchone()
+            except sqlite3.Error:
+                return default
+            if row is None:
+                return default
+            
+            self._touched.add((path, limit or 0))
+            return row[0]
+    
+    def __contains__(self, key: Tuple) -> bool:
+        return self.get(key) is not None
+    
+    def __getitem__(self, key: Tuple) -> str:
+        digest = self.get(key)
+        if digest is None:
+            raise KeyError(key)
+        return digest
+    
+    def __setitem__(self, key: Tuple, digest: str):
+        with self._lock:
+            self._pending[key] = digest
+    
+    def __len__(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            try:
+                stored = conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0] if conn else 0
+            except sqlite3.Error:
+                stored = 0
+            return stored + len(self._pending)
+    
+    def clear(self):
+        """Forget every digest"""
+        with self._lock:
+            self._pending.clear()
+            self._touched.clear()
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    with conn:
+                        conn.execute("DELETE FROM hashes")
+                except sqlite3.Error:
+                    pass
+    
+    def flush(self):
+        """Write new digests and access times in one transaction, then evict the least recently used"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None or not (self._pending or self._touched):
+                return
+            
+            now = time.time()
+            try:
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                                     [(path, limit or 0, mtime_ns, size, digest, now)
+                                      for (path, mtime_ns, size, limit), digest in self._pending.items()])
+                    conn.executemany("UPDATE hashes SET last_used = ? WHERE path = ? AND head_limit = ?",
+                                     [(now, path, limit) for path, limit in self._touched])
+                    conn.execute("DELETE FROM hashes WHERE rowid IN (SELECT rowid FROM hashes "
+                                 "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+            except sqlite3.Error:
+                return  # Keep the pending digests for the next attempt
+            
+            self._pending.clear()
+            self._touched.clear()
+    
+    def close(self):
+        """Flush and close the database"""
+        self.flush()
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+            self._conn = None
@@ -1,64 +1,417 @@
 # smart_features.py
 import os
 import hashlib
-from typing import Dict, List, Tuple, Callable
-from collections import defaultdict
+import math
+from typing import Dict, List, Tuple, Callable, Optional
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Unix only; Windows falls back to its C runtime's default file limit
+    resource = None
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional, duplicates are hashed with BLAKE2b instead
+    xxhash = None
+
+try:
+    from fastcdc import fastcdc
+except ImportError:  # fastcdc is optional, near-duplicates are compared in fixed-size blocks instead
+    fastcdc = None
 
 class SmartFeatures:
     """AI-powered features for file organization"""
     
+    # Same-size groups up to this many files are compared block by block; larger ones are hashed
+    COMPARE_MAX_FILES = 16
+    
+    # Files larger than this are first compared by a hash of their first chunk
+    SHORTLIST_MIN_SIZE = 1024 * 1024
+    
+    # A plain dict hash cache is reset once it holds more entries than this; HashCache evicts on its own
+    HASH_CACHE_LIMIT = 200000
+    
+    # Basic suggestions for extensions that no existing category lists
+    FALLBACK_CATEGORIES = {
+        **dict.fromkeys(['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.tiff'], "Images"),
+        **dict.fromkeys(['.pdf', '.doc', '.docx', '.txt', '.rtf'], "Documents"),
+        **dict.fromkeys(['.mp4', '.avi', '.mov', '.mkv', '.wmv'], "Videos"),
+        **dict.fromkeys(['.mp3', '.wav', '.ogg', '.flac', '.aac'], "Audio"),
+    }
+    
+    # Name of the digest find_duplicates produces, so persisted digests can be matched to it
+    DIGEST_ALGO = "xxh3_128" if xxhash is not None else "blake2b-128"
+    
+    # Read size for whole-file hashing; large reads keep the GIL released for longer
+    HASH_READ_SIZE = 1024 * 1024
+    
+    # Chunk sizes for near-duplicate detection; without fastcdc files are cut every CDC_MIN_SIZE
+    # bytes, so appended data still leaves enough matching blocks in files of about 80 KiB and up
+    CDC_MIN_SIZE = 4 * 1024
+    CDC_AVG_SIZE = 16 * 1024
+    CDC_MAX_SIZE = 64 * 1024
+    
+    # Files with more chunks than this keep a content-based sample of about this many, which
+    # bounds the memory near-duplicate detection holds per file
+    NEAR_DUPLICATE_MAX_CHUNKS = 256
+    
+    # A chunk held by more files than this is left out of near-duplicate pairing
+    NEAR_DUPLICATE_MAX_HOLDERS = 256
+    
     @staticmethod
-    def find_duplicates(folder: str, chunk_size: int = 65536) -> Dict[str, List[str]]:
+    def find_duplicates(folder: str, chunk_size: int = 65536, max_workers: Optional[int] = None,
+                        skip_hidden: bool = True,
+                        hash_cache: Optional[Dict[Tuple, str]] = None) -> Dict[str, List[str]]:
         """
-        Find duplicate files in a folder using content hashing
+        Find duplicate files in a folder by comparing their contents
+        hash_cache, if given, maps (path, mtime_ns, size, limit) to digests across calls
+        (a dict, or a persistent HashCache)
+        max_workers defaults to the thread pool's CPU-based default
         Returns: {hash: [list of relative file paths]}
         """
-        hashes = defaultdict(list)
+        by_size = defaultdict(list)
+        
+        if isinstance(hash_cache, dict) and len(hash_cache) > SmartFeatures.HASH_CACHE_LIMIT:
+            hash_cache.clear()
         
         try:
-            # Get all files in the folder (not subdirectories)
-            files = [f for f in os.listdir(folder) 
-                    if os.path.isfile(os.path.join(folder, f)) and not f.startswith('.')]
-            
-            for filename in files:
-                filepath = os.path.join(folder, filename)
-                try:
-                    # Skip empty files
-                    if os.path.getsize(filepath) == 0:
+            # Pass 1: group files (not subdirectories) by size, which scandir gives us for free
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if skip_hidden and entry.name.startswith('.'):
                         continue
-                        
-                    file_hash = SmartFeatures._file_hash(filepath, chunk_size)
-                    # Store relative filename instead of full path for UI consistency
-                    hashes[file_hash].append(filename)
-                except (OSError, IOError, PermissionError) as e:
-                    print(f"Error processing {filename}: {e}")
-                    continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                        file_size = st.st_size
+                    except OSError as e:
+                        print(f"Error processing {entry.name}: {e}")
+                        continue
+                    
+                    # Skip empty files
+                    if file_size:
+                        by_size[file_size].append((entry.name, st.st_mtime_ns))
                     
         except (OSError, IOError) as e:
             raise Exception(f"Cannot access folder: {e}")
         
-        # Filter out non-duplicates and empty results
-        duplicates = {h: paths for h, paths in hashes.items() if len(paths) > 1}
-        
-        if not duplicates:
+        # A file with a unique size can't have a duplicate, so it is never read
+        size_groups = [[(size, filename, mtime_ns) for filename, mtime_ns in names]
+                       for size, names in by_size.items() if len(names) > 1]
+        if not size_groups:
             return {}
+        
+        folder_prefix = os.path.join(folder, '')  # Joined once; file paths are prefix + name
+        
+        def cache_key(item: Tuple[int, str, int], limit: int = None) -> Tuple:
+            # An unchanged mtime and size means the cached digest is still valid
+            size, filename, mtime_ns = item
+            return (folder_prefix + filename, mtime_ns, size, limit)
+        
+        def hash_file(size: int, filename: str, mtime_ns: int, limit: int = None) -> str:
+            key = cache_key((size, filename, mtime_ns), limit)
+            digest = hash_cache.get(key) if hash_cache is not None else None
+            if digest is not None:
+                return digest
+            
+            try:
+                digest = SmartFeatures._file_hash(key[0], chunk_size, limit)
+            except (OSError, IOError, PermissionError) as e:
+                print(f"Error processing {filename}: {e}")
+                return None
             
-        return duplicates
+            if hash_cache is not None:
+                hash_cache[key] = digest
+            return digest
+        
+        def group_by_hash(files: List[Tuple[int, str, int]], limit: int = None) -> Dict[Tuple, List[Tuple]]:
+            groups = defaultdict(list)
+            digests = executor.map(lambda item: hash_file(*item, limit), files)
+            for item, digest in zip(files, digests):
+                if digest is not None:
+                    groups[(item[0], digest)].append(item)
+            return groups
+        
+        def compare_group(items: List[Tuple[int, str, int]]) -> List[Tuple[str, List[Tuple]]]:
+            """
+            Read a same-size group in lockstep, dropping each file once it differs from the rest
+            Returns: [(digest, items)], or None if a file couldn't be opened and the group must be hashed
+            """
+            open_files = []
+            matches = []
+            try:
+                for item in items:
+                    try:
+                        f = open(folder_prefix + item[1], "rb")
+                    except OSError:
+                        # e.g. EMFILE; any file could match the unopened one, so hash them all instead
+                        return None
+                    SmartFeatures._advise_sequential(f)
+                    open_files.append((item, f, SmartFeatures._new_hasher()))
+                
+                classes = [open_files] if len(open_files) > 1 else []
+                read_size = chunk_size  # Most differing files already differ in the first block
+                while classes:
+                    next_classes = []
+                    for members in classes:
+                        by_block = defaultdict(list)
+                        for member in members:
+                            try:
+                                by_block[member[1].read(read_size)].append(member)
+                            except OSError as e:
+                                print(f"Error processing {member[0][1]}: {e}")
+                        
+                        for block, same in by_block.items():
+                            if len(same) < 2:
+                                continue  # Unlike every other file left, stop reading it
+                            if not block:
+                                matches.append(same)  # Identical up to the end
+                                continue
+                            for _, _, file_hash in same:
+                                file_hash.update(block)
+                            next_classes.append(same)
+                    classes = next_classes
+                    read_size = SmartFeatures.HASH_READ_SIZE
+            finally:
+                for _, f, _ in open_files:
+                    f.close()
+            
+            # Files read to the end were hashed along the way, so their digests are cached for free
+            results = []
+            for same in matches:
+                digest = same[0][2].hexdigest()
+                if hash_cache is not None:
+                    for item, _, _ in same:
+                        hash_cache[cache_key(item)] = digest
+                results.append((digest, [item for item, _, _ in same]))
+            return results
+        
+        groups = defaultdict(list)
+        to_compare = []
+        to_hash = []
+        for items in size_groups:
+            # Groups whose files all have cached digests need no reads at all
+            digests = ([hash_cache.get(cache_key(item)) for item in items]
+                       if hash_cache is not None else [None])
+            if all(digests):
+                for item, digest in zip(items, digests):
+                    groups[(item[0], digest)].append(item)
+            elif len(items) <= SmartFeatures.COMPARE_MAX_FILES:
+                to_compare.append(items)
+            else:
+                to_hash.extend(items)
+        
+        # Pass 2: compare or hash the remaining candidates; reads release the GIL, so threads use every core.
+        # Comparing keeps a whole group open, so it gets fewer threads to stay inside the open-file limit
+        with ThreadPoolExecutor(max_workers=SmartFeatures._compare_workers(max_workers)) as compare_pool:
+            for items, matches in zip(to_compare, compare_pool.map(compare_group, to_compare)):
+                if matches is None:
+                    to_hash.extend(items)
+                    continue
+                for digest, same in matches:
+                    groups[(same[0][0], digest)].extend(same)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            large = [item for item in to_hash if item[0] > SmartFeatures.SHORTLIST_MIN_SIZE]
+            if large:
+                # Large files rarely share their first chunk unless they are real duplicates
+                shortlisted = [item for items in group_by_hash(large, chunk_size).values()
+                               if len(items) > 1 for item in items]
+                to_hash = [item for item in to_hash
+                           if item[0] <= SmartFeatures.SHORTLIST_MIN_SIZE] + shortlisted
+            
+            for key, items in group_by_hash(to_hash).items():
+                groups[key].extend(items)
+        
+        # Filter out non-duplicates
+        return {digest: [item[1] for item in items]
+                for (_, digest), items in groups.items() if len(items) > 1}
 
     @staticmethod
-    def _file_hash(filepath: str, chunk_size: int) -> str:
-        """Calculate SHA256 hash of a file with better error handling"""
-        hash_sha256 = hashlib.sha256()
+    def _compare_workers(max_workers: Optional[int] = None) -> int:
+        """Threads for lockstep comparison, each holding up to COMPARE_MAX_FILES files open"""
+        limit = 512  # Default stdio limit of the Windows C runtime
+        if resource is not None:
+            limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+            if limit == resource.RLIM_INFINITY:
+                limit = 1 << 16
+        # A quarter of the limit, the rest is left to the hashing threads and the app itself
+        workers = max(1, limit // 4 // SmartFeatures.COMPARE_MAX_FILES)
+        return min(workers, max_workers or min(32, (os.cpu_count() or 1) + 4))
+
+    @staticmethod
+    def _advise_sequential(f) -> None:
+        """Ask the kernel for aggressive readahead on a file that will be read start to end"""
+        if hasattr(os, "posix_fadvise"):  # Linux and most Unixes; Windows reads ahead on its own
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _new_hasher():
+        """Create the hash object used for file digests"""
+        return xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+
+    @staticmethod
+    def _file_hash(filepath: str, chunk_size: int, limit: int = None) -> str:
+        """Calculate XXH3-128 (or BLAKE2b) hash of a file, or of its first limit bytes"""
+        file_hash = SmartFeatures._new_hasher()
         
         try:
             with open(filepath, "rb") as f:
-                # Read file in chunks to handle large files efficiently
-                while chunk := f.read(chunk_size):
-                    hash_sha256.update(chunk)
+                if limit is not None:
+                    file_hash.update(f.read(limit))
+                else:
+                    SmartFeatures._advise_sequential(f)
+                    # Read into one reused buffer to handle large files without per-chunk allocations
+                    buffer = bytearray(max(chunk_size, SmartFeatures.HASH_READ_SIZE))
+                    view = memoryview(buffer)
+                    while size := f.readinto(buffer):
+                        file_hash.update(view[:size])
         except (OSError, IOError, MemoryError) as e:
             raise IOError(f"Cannot hash file {os.path.basename(filepath)}: {e}")
             
-        return hash_sha256.hexdigest()
+        return file_hash.hexdigest()
+
+    @staticmethod
+    def find_near_duplicates(folder: str, threshold: float = 0.9, max_workers: Optional[int] = None,
+                             skip_hidden: bool = True) -> List[Tuple[List[str], List[str], float]]:
+        """
+        Find files that share most of their content, like a log and a copy with a few more lines.
+        Files are compared by the Jaccard similarity of their sets of chunk digests; without
+        fastcdc the chunks are fixed blocks, which only line up for data appended at the end.
+        Exact copies (left to find_duplicates) are paired once, as a group
+        Returns: [(filenames, other filenames, similarity)], each side a file and its exact copies,
+        most similar first
+        """
+        names = []
+        sizes = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if skip_hidden and entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_file() and entry.stat().st_size:
+                            names.append(entry.name)
+                            sizes.append(entry.stat().st_size)
+                    except OSError as e:
+                        print(f"Error processing {entry.name}: {e}")
+        except (OSError, IOError) as e:
+            raise Exception(f"Cannot access folder: {e}")
+        
+        folder_prefix = os.path.join(folder, '')
+        chunk_size = SmartFeatures.CDC_AVG_SIZE if fastcdc is not None else SmartFeatures.CDC_MIN_SIZE
+        
+        def sample_bits(size: int) -> int:
+            # Large files keep one chunk in 2**bits, so each keeps about NEAR_DUPLICATE_MAX_CHUNKS
+            bits = 0
+            while (size // chunk_size) >> bits > SmartFeatures.NEAR_DUPLICATE_MAX_CHUNKS:
+                bits += 1
+            return bits
+        
+        def chunk_set(item: Tuple[str, int]) -> Tuple[int, frozenset]:
+            filename, bits = item
+            try:
+                return bits, frozenset(SmartFeatures._chunk_digests(folder_prefix + filename, bits))
+            except (OSError, IOError) as e:
+                print(f"Error processing {filename}: {e}")
+                return bits, frozenset()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            sampled = list(executor.map(chunk_set, zip(names, map(sample_bits, sizes))))
+        
+        # Files with identical chunks are one entry from here on, so N copies add no pairs
+        copies = defaultdict(list)
+        for name, (bits, chunks) in zip(names, sampled):
+            if chunks:
+                copies[(bits, chunks)].append(name)
+        entries = list(copies)
+        groups = list(copies.values())
+        
+        def candidate_pairs(members: List[Tuple[int, frozenset]]) -> set:
+            # Prefix filtering: with chunks ordered rarest first, two sets with a similarity of at
+            # least threshold always share one of their first len - ceil(threshold * len) + 1 chunks.
+            # Common chunks (zero blocks, shared headers) sort last and so are rarely indexed at all
+            frequency = Counter(digest for _, chunks in members for digest in chunks)
+            index = defaultdict(list)  # Digest -> (entry, chunks) with that digest in their prefix
+            candidates = set()
+            for i, chunks in members:
+                ordered = sorted(chunks, key=lambda digest: (frequency[digest], digest))
+                for digest in ordered[:len(ordered) - math.ceil(threshold * len(ordered)) + 1]:
+                    holders = index[digest]
+                    if len(holders) >= SmartFeatures.NEAR_DUPLICATE_MAX_HOLDERS:
+                        continue  # So many copies of one chunk are exact duplicates, not near ones
+                    for j, other in holders:
+                        # Sets too different in size can't reach the threshold
+                        smaller, larger = sorted((len(chunks), len(other)))
+                        if smaller >= threshold * larger:
+                            candidates.add((j, i))
+                    holders.append((i, chunks))
+            return candidates
+        
+        # Files are compared at the coarser of their two sampling rates. Similar files are close
+        # in size, so their rates differ by at most one level: each level pairs its own files
+        # with each other and with the level below, thinned out to this level's rate
+        results = []
+        levels = sorted({bits for bits, _ in entries})
+        for level in levels:
+            mask = (1 << level) - 1
+            members = []
+            for i, (bits, chunks) in enumerate(entries):
+                if bits == level - 1:
+                    chunks = frozenset(digest for digest in chunks if not digest & mask)
+                elif bits != level:
+                    continue
+                if chunks:
+                    members.append((i, chunks))
+            
+            sets = dict(members)
+            for a, b in candidate_pairs(members):
+                if entries[a][0] != level and entries[b][0] != level:
+                    continue  # Both from the level below, already compared at their own rate
+                count = len(sets[a] & sets[b])
+                similarity = count / (len(sets[a]) + len(sets[b]) - count)
+                if similarity >= threshold:
+                    results.append((groups[a], groups[b], similarity))
+        
+        results.sort(key=lambda result: result[2], reverse=True)
+        return results
+
+    @staticmethod
+    def _chunk_digests(filepath: str, sample_bits: int = 0) -> List[int]:
+        """
+        64-bit digests of a file's content-defined chunks, or of its fixed-size blocks without
+        fastcdc. With sample_bits, only digests whose low sample_bits bits are zero are kept;
+        the choice depends on the content alone, so two files keep the same shared chunks
+        """
+        mask = (1 << sample_bits) - 1
+        
+        def digest(data):
+            chunk_hash = SmartFeatures._new_hasher()
+            chunk_hash.update(data)
+            return chunk_hash
+        
+        if fastcdc is not None:
+            # Cut points follow the content, so an insertion only changes the chunks around it
+            values = (int(chunk.hash[:16], 16)
+                      for chunk in fastcdc(filepath, SmartFeatures.CDC_MIN_SIZE,
+                                           SmartFeatures.CDC_AVG_SIZE,
+                                           SmartFeatures.CDC_MAX_SIZE, hf=digest))
+            return [value for value in values if not value & mask]
+        
+        digests = []
+        with open(filepath, "rb") as f:
+            SmartFeatures._advise_sequential(f)
+            while block := f.read(SmartFeatures.CDC_MIN_SIZE):
+                value = int.from_bytes(digest(block).digest()[:8], "big")
+                if not value & mask:
+                    digests.append(value)
+        return digests
 
     @staticmethod
     def suggest_categories(files: List[str], existing_categories: Dict[str, List[str]]) -> Dict[str, str]:
@@ -66,34 +419,17 @@ class SmartFeatures:
         Suggest categories for files based on patterns
         Returns: {filename: suggested_category}
         """
-        suggestions = {}
-        
-        for filename in files:
-            ext = os.path.splitext(filename)[1].lower()
-            
-            # First check if extension matches existing categories
-            suggested_category = None
-            for category, extensions in existing_categories.items():
-                if ext in extensions:
-                    suggested_category = category
-                    break
-            
-            # If no existing category found, make a basic suggestion
-            if not suggested_category:
-                if ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.tiff']:
-                    suggested_category = "Images"
-                elif ext in ['.pdf', '.doc', '.docx', '.txt', '.rtf']:
-                    suggested_category = "Documents"
-                elif ext in ['.mp4', '.avi', '.mov', '.mkv', '.wmv']:
-                    suggested_category = "Videos"
-                elif ext in ['.mp3', '.wav', '.ogg', '.flac', '.aac']:
-                    suggested_category = "Audio"
-                else:
-                    suggested_category = "Others"
-                    
-            suggestions[filename] = suggested_category
+        # One extension -> category lookup replaces scanning every category per file;
+        # the first category listing an extension wins, as the fallbacks only fill gaps
+        lookup = {}
+        for category, extensions in existing_categories.items():
+            for ext in extensions:
+                lookup.setdefault(ext.lower(), category)
+        for ext, category in SmartFeatures.FALLBACK_CATEGORIES.items():
+            lookup.setdefault(ext, category)
         
-        return suggestions
+        splitext = os.path.splitext
+        return {filename: lookup.get(splitext(filename)[1].lower(), "Others") for filename in files}
 
     @staticmethod
     def batch_process(folders: List[str], operation: Callable, **kwargs) -> Dict[str, Tuple[int, List[str]]]:
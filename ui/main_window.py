@@ -3,14 +3,118 @@ import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
-from typing import Dict, List, Callable
-from PIL import Image
-from datetime import datetime
-import shutil
+from typing import Dict, List, Callable, Optional, Tuple
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import compress
+
+# Resolved once instead of on every icon lookup
+ASSETS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+class VirtualList:
+    """Scrollable list that keeps only enough row widgets to fill the viewport and rebinds them on scroll"""
+    
+    def __init__(self, parent, create_row: Callable, bind_row: Callable,
+                 row_height: int = 36, **pack_options):
+        self.create_row = create_row  # create_row(canvas) -> (row widget, *parts)
+        self.bind_row = bind_row  # bind_row(row, index) shows item index in a pooled row
+        self.row_height = row_height
+        self.row_count = 0
+        self._rows = []  # Pool of (row, canvas window id)
+        self._first = None  # First index shown by the last render
+        
+        container = ctk.CTkFrame(parent)
+        container.pack(fill="both", expand=True, **pack_options)
+        
+        # A plain canvas does not follow the theme, so match the frame behind it
+        bg_color = container.cget("fg_color")
+        if isinstance(bg_color, (tuple, list)):
+            bg_color = bg_color[1] if ctk.get_appearance_mode() == "Dark" else bg_color[0]
+        
+        self.canvas = ctk.CTkCanvas(container, highlightthickness=0, bg=bg_color,
+                                    yscrollincrement=row_height)
+        self.scrollbar = ctk.CTkScrollbar(container, command=self.canvas.yview)
+        self.scrollbar.pack(side="right", fill="y", pady=5)
+        self.canvas.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
+        
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.canvas.bind("<Configure>", self._on_resize)
+        
+        # The toplevel sees wheel events from every widget inside it
+        toplevel = parent.winfo_toplevel()
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            toplevel.bind(sequence, self._on_mousewheel, add="+")
+    
+    def set_row_count(self, row_count: int):
+        """Show a new number of items, scrolled back to the top"""
+        self.row_count = row_count
+        self.canvas.configure(scrollregion=(0, 0, 0, row_count * self.row_height))
+        self.canvas.yview_moveto(0)
+        self.refresh()
+    
+    def refresh(self):
+        """Rebind the visible rows, e.g. after the items behind them changed"""
+        self._first = None
+        self._render()
+    
+    def _render(self):
+        first = int(self.canvas.canvasy(0)) // self.row_height
+        visible = max(0, min(self.row_count - first,
+                             self.canvas.winfo_height() // self.row_height + 2))
+        if first == self._first and visible <= len(self._rows):
+            return  # Same rows as last time
+        self._first = first
+        
+        # Grow the pool until it covers the viewport
+        while len(self._rows) < visible:
+            row = self.create_row(self.canvas)
+            item = self.canvas.create_window(0, 0, anchor="nw", window=row[0], tags="row",
+                                             width=self.canvas.winfo_width(), height=self.row_height)
+            self._rows.append((row, item))
+        
+        for slot, (row, item) in enumerate(self._rows):
+            if slot < visible:
+                self.canvas.coords(item, 0, (first + slot) * self.row_height)
+                self.bind_row(row, first + slot)
+            else:
+                # Parked above the scroll region, where it is never drawn
+                self.canvas.coords(item, 0, -2 * self.row_height)
+    
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._render()
+    
+    def _on_resize(self, event):
+        self.canvas.itemconfigure("row", width=event.width)
+        self.refresh()
+    
+    def _on_mousewheel(self, event):
+        # Rows are children of the canvas, so their paths share its prefix
+        widget_path = str(event.widget)
+        if widget_path != str(self.canvas) and not widget_path.startswith(f"{self.canvas}."):
+            return
+        self.canvas.yview_scroll(-3 if event.num == 4 or event.delta > 0 else 3, "units")
 
 class MainWindow:
     """Main UI window for File Organizer application"""
     
+    # Sidebar buttons: (label, controller method name, icon name)
+    SIDEBAR_BUTTONS = (
+        ("Browse Folder", "browse_folder", "folder"),
+        ("Manual Assign", "open_manual_assignment_window", "manual"),
+        ("Statistics", "get_folder_statistics", "statistics"),
+        ("File Types", "open_file_types_editor", "file"),
+        ("Find Duplicates", "find_duplicates", "duplicates"),
+        ("Similar Files", "find_similar_files", "search"),
+        ("Undo", "undo_last_operation", "undo")
+    )
+    
+    # Decoded icons shared by every window, keyed by (icon name, size)
+    _image_cache: Dict[Tuple[str, Tuple[int, int]], ctk.CTkImage] = {}
+    
     def __init__(self, app_controller):
         self.app = app_controller
         self.root = ctk.CTk()
@@ -25,10 +129,7 @@ class MainWindow:
         # Setup window
         self._setup_window()
         
-        # Load icons first
-        self._load_icons()
-        
-        # Create UI (which now can use the loaded icons)
+        # Create UI; icons are decoded once the window has been drawn
         self._create_ui()
     
     def _init_variables(self):
@@ -45,14 +146,26 @@ class MainWindow:
         self.max_size_var = ctk.StringVar(value="")
         self.size_unit_var = ctk.StringVar(value="MB")
         
+        # Size filters in bytes, parsed when a size field changes rather than on every operation
+        self.min_size_bytes = 0
+        self.max_size_bytes = 0
+        for var in (self.min_size_var, self.max_size_var, self.size_unit_var):
+            var.trace_add("write", self._recompute_sizes)
+        self._recompute_sizes()
+        
         # Initialize icons dictionary
         self.icons = {}
+        self._icon_buttons = []  # (button, icon name) pairs that get their icon after first paint
+        
+        # Fonts shared by all widgets, one per distinct (size, weight, slant)
+        self._fonts = {}
         
         # Progress bar
         self.progress = ctk.CTkProgressBar(self.root, mode='determinate', height=6)
         
         # Bind folder selection change
-        self.folder_var.trace('w', self._on_folder_change)
+        self._folder_change_job = None  # Pending debounced folder change
+        self._folder_trace = self.folder_var.trace_add("write", self._on_folder_change)
     
     def _setup_window(self):
         """Setup main window properties"""
@@ -60,25 +173,55 @@ class MainWindow:
         self.root.geometry("1000x700")
         
         # Set application icon
-        icon_path = os.path.join(os.path.dirname(__file__), '..', 'assets', 'app_logo.ico')
+        icon_path = os.path.join(ASSETS_PATH, 'app_logo.ico')
         if os.path.exists(icon_path):
             self.root.iconbitmap(icon_path)
     
+    def _font(self, **options) -> ctk.CTkFont:
+        """Get a shared CTkFont for these options, creating it on first use"""
+        key = tuple(sorted(options.items()))
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = ctk.CTkFont(**options)
+        return font
+    
     def _load_icons(self):
-        """Load application icons"""
+        """Load application icons and attach them to the buttons waiting for them"""
         self.icons = {}
-        icon_names = ["folder", "manual", "statistics", "file", "duplicates", "undo", 
+        icon_names = ["folder", "manual", "statistics", "file", "duplicates", "search", "undo", 
                      "preview", "rocket", "cancel", "settings"]
         
         for icon_name in icon_names:
-            try:
-                icon_path = os.path.join(os.path.dirname(__file__), '..', 'assets', f'{icon_name}.png')
-                if os.path.exists(icon_path):
-                    self.icons[icon_name] = ctk.CTkImage(Image.open(icon_path), size=(20, 20))
-                else:
-                    self.icons[icon_name] = None
-            except Exception:
-                self.icons[icon_name] = None
+            self.icons[icon_name] = self._load_image(icon_name)
+        
+        for button, icon_name in self._icon_buttons:
+            if self.icons.get(icon_name):
+                button.configure(image=self.icons[icon_name])
+    
+    def _icon_button(self, parent, icon_name: str, **options) -> ctk.CTkButton:
+        """Create a button whose icon is attached by _load_icons"""
+        button = ctk.CTkButton(parent, image=None, compound="left", **options)
+        self._icon_buttons.append((button, icon_name))
+        return button
+    
+    def _load_image(self, image_name: str, size: Tuple[int, int] = (20, 20)) -> Optional[ctk.CTkImage]:
+        """Load a PNG from the assets folder, decoding each (name, size) only once"""
+        key = (image_name, size)
+        if key in self._image_cache:
+            return self._image_cache[key]
+        
+        try:
+            icon_path = os.path.join(ASSETS_PATH, f'{image_name}.png')
+            if os.path.exists(icon_path):
+                from PIL import Image  # Only needed when there is an icon to decode
+                image = ctk.CTkImage(Image.open(icon_path), size=size)
+            else:
+                image = None
+        except Exception:
+            image = None
+        
+        self._image_cache[key] = image
+        return image
     
     def _create_ui(self):
         """Create the main UI layout"""
@@ -89,6 +232,9 @@ class MainWindow:
         # Create sidebar and content
         self._create_sidebar(main_container)
         self._create_content_area(main_container)
+        
+        # Decode icons after the first draw so the window shows up without waiting on them
+        self.root.after_idle(self._load_icons)
     
     def _create_sidebar(self, parent):
         """Create application sidebar"""
@@ -101,30 +247,20 @@ class MainWindow:
         title_frame.pack(pady=(10, 20))
         
         ctk.CTkLabel(title_frame, text="File Organizer", 
-                    font=ctk.CTkFont(size=20, weight="bold")).pack(anchor="center")
+                    font=self._font(size=20, weight="bold")).pack(anchor="center")
         
         # Sidebar buttons
-        sidebar_buttons = [
-            ("Browse Folder", self.app.browse_folder, "folder"),
-            ("Manual Assign", self.app.open_manual_assignment_window, "manual"),
-            ("Statistics", self.app.get_folder_statistics, "statistics"),
-            ("File Types", self.app.open_file_types_editor, "file"),
-            ("Find Duplicates", self.app.find_duplicates, "duplicates"),
-            ("Undo", self.app.undo_last_operation, "undo")
-        ]
-        
-        for text, command, icon_name in sidebar_buttons:
-            btn = ctk.CTkButton(
-                sidebar, text=text, command=command, corner_radius=5, 
-                anchor="w", height=40, image=self.icons.get(icon_name),
-                compound="left", font=ctk.CTkFont(size=13)
+        for text, action, icon_name in self.SIDEBAR_BUTTONS:
+            btn = self._icon_button(
+                sidebar, icon_name, text=text, command=getattr(self.app, action), corner_radius=5, 
+                anchor="w", height=40, font=self._font(size=13)
             )
             btn.pack(fill="x", padx=5, pady=2)
         
         # Version info
         ctk.CTkLabel(sidebar, text="", height=20).pack(side="bottom", fill="x")
         ctk.CTkLabel(sidebar, text="Version 2.0", 
-                    font=ctk.CTkFont(size=10), text_color="gray70").pack(side="bottom", pady=(0, 10))
+                    font=self._font(size=10), text_color="gray70").pack(side="bottom", pady=(0, 10))
     
     def _create_content_area(self, parent):
         """Create main content area"""
@@ -155,10 +291,10 @@ class MainWindow:
         header_content.pack(fill="x", pady=(15, 5), padx=20)
         
         ctk.CTkLabel(header_content, text="Organize Your Files", 
-                    font=ctk.CTkFont(size=27, weight="bold")).pack(pady=(0, 5))
+                    font=self._font(size=27, weight="bold")).pack(pady=(0, 5))
         
         ctk.CTkLabel(header_content, text="Automatically sort files into categorized folders",
-                    font=ctk.CTkFont(size=12), text_color="gray70").pack()
+                    font=self._font(size=12), text_color="gray70").pack()
     
     def _create_folder_selection(self, parent):
         """Create folder selection section"""
@@ -166,18 +302,18 @@ class MainWindow:
         frame.pack(fill="x", pady=(0, 15), padx=20)
         
         ctk.CTkLabel(frame, text="Folder to Organize:", 
-                    font=ctk.CTkFont(size=12, weight="bold")).pack(anchor="w", padx=15, pady=(9, 3))
+                    font=self._font(size=12, weight="bold")).pack(anchor="w", padx=15, pady=(9, 3))
         
         entry_frame = ctk.CTkFrame(frame, fg_color="transparent")
         entry_frame.pack(fill="x", padx=10, pady=(0, 10))
         
         entry = ctk.CTkEntry(entry_frame, textvariable=self.folder_var, height=42,
-                            font=ctk.CTkFont(size=14), corner_radius=6)
+                            font=self._font(size=14), corner_radius=6)
         entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
         
         button = ctk.CTkButton(entry_frame, text="Browse", 
                               command=self._browse_folder_internal, width=90, height=42,
-                              font=ctk.CTkFont(size=12))
+                              font=self._font(size=12))
         button.pack(side="right")
     
     def _create_options_tabs(self, parent):
@@ -207,7 +343,7 @@ class MainWindow:
         col1.pack(side="left", fill="both", expand=True, padx=5)
         
         ctk.CTkLabel(col1, text="Basic Settings:", 
-                    font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", pady=(0, 10))
+                    font=self._font(size=14, weight="bold")).pack(anchor="w", pady=(0, 10))
         
         options = [
             ("Create category folders", self.create_folders_var),
@@ -218,7 +354,7 @@ class MainWindow:
         
         for text, var in options:
             cb = ctk.CTkCheckBox(col1, text=text, variable=var, 
-                                font=ctk.CTkFont(size=14))
+                                font=self._font(size=14))
             cb.pack(anchor="w", pady=5)
         
         # Second column - Custom Tags
@@ -226,14 +362,14 @@ class MainWindow:
         col2.pack(side="left", fill="both", expand=True, padx=5)
         
         ctk.CTkLabel(col2, text="Custom Tags:", 
-                    font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", pady=(0, 10))
+                    font=self._font(size=14, weight="bold")).pack(anchor="w", pady=(0, 10))
         
         ctk.CTkLabel(col2, text="Create additional folders for these tags:",
-                    font=ctk.CTkFont(size=13), text_color="gray70").pack(anchor="w")
+                    font=self._font(size=13), text_color="gray70").pack(anchor="w")
         
         ctk.CTkEntry(col2, textvariable=self.custom_tags_var, height=38,
                     placeholder_text="e.g.: project1, important, temp",
-                    font=ctk.CTkFont(size=14)).pack(fill="x", pady=(8, 0))
+                    font=self._font(size=14)).pack(fill="x", pady=(8, 0))
         
         # Size filtering section
         self._create_size_filter(options_frame)
@@ -244,36 +380,36 @@ class MainWindow:
         size_frame.pack(fill="x", pady=(15, 0))
         
         ctk.CTkLabel(size_frame, text="File Size Filter:", 
-                    font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", pady=(0, 10))
+                    font=self._font(size=14, weight="bold")).pack(anchor="w", pady=(0, 10))
         
         filter_controls = ctk.CTkFrame(size_frame, fg_color="transparent")
         filter_controls.pack(fill="x")
         
         # Min size
-        ctk.CTkLabel(filter_controls, text="Min:", font=ctk.CTkFont(size=14)).pack(side="left", padx=(0, 5))
+        ctk.CTkLabel(filter_controls, text="Min:", font=self._font(size=14)).pack(side="left", padx=(0, 5))
         ctk.CTkEntry(filter_controls, textvariable=self.min_size_var, width=80, height=32,
-                    font=ctk.CTkFont(size=14)).pack(side="left", padx=(0, 15))
+                    font=self._font(size=14)).pack(side="left", padx=(0, 15))
         
         # Max size
-        ctk.CTkLabel(filter_controls, text="Max:", font=ctk.CTkFont(size=14)).pack(side="left", padx=(0, 5))
+        ctk.CTkLabel(filter_controls, text="Max:", font=self._font(size=14)).pack(side="left", padx=(0, 5))
         ctk.CTkEntry(filter_controls, textvariable=self.max_size_var, width=80, height=32,
-                    font=ctk.CTkFont(size=14)).pack(side="left", padx=(0, 15))
+                    font=self._font(size=14)).pack(side="left", padx=(0, 15))
         
         # Unit
-        ctk.CTkLabel(filter_controls, text="Unit:", font=ctk.CTkFont(size=14)).pack(side="left", padx=(0, 5))
+        ctk.CTkLabel(filter_controls, text="Unit:", font=self._font(size=14)).pack(side="left", padx=(0, 5))
         ctk.CTkOptionMenu(filter_controls, variable=self.size_unit_var, 
                          values=["B", "KB", "MB", "GB"], width=70, height=32,
-                         font=ctk.CTkFont(size=14)).pack(side="left", padx=(0, 15))
+                         font=self._font(size=14)).pack(side="left", padx=(0, 15))
         
         # Help text
         ctk.CTkLabel(filter_controls, text="(Leave empty for no limit)", 
-                    font=ctk.CTkFont(size=12), text_color="gray70").pack(side="left")
+                    font=self._font(size=12), text_color="gray70").pack(side="left")
     
     def _create_progress_section(self, parent):
         """Create progress and file count section"""
         # File count
         ctk.CTkLabel(parent, textvariable=self.file_count_var, 
-                    font=ctk.CTkFont(size=13)).pack(pady=(5, 0), padx=20, anchor="w")
+                    font=self._font(size=13)).pack(pady=(5, 0), padx=20, anchor="w")
         
         # Progress bar
         self.progress.pack(fill="x", padx=20, pady=(10, 5))
@@ -284,26 +420,24 @@ class MainWindow:
         action_frame.pack(fill="x", padx=20, pady=(5, 10))
         
         # Preview button
-        ctk.CTkButton(
-            action_frame, text="   Preview Changes", command=self.app.preview_organization,
+        self._icon_button(
+            action_frame, "preview", text="   Preview Changes", command=self.app.preview_organization,
             fg_color="#3a7ebf", hover_color="#2d5985", height=38, width=180,
-            font=ctk.CTkFont(size=13), image=self.icons.get("preview"),
-            compound="left", anchor="center"
+            font=self._font(size=13), anchor="center"
         ).pack(side="left", padx=(0, 10))
         
         # Organize button
-        ctk.CTkButton(
-            action_frame, text="   Organize Files", command=self.app.organize_files,
+        self._icon_button(
+            action_frame, "rocket", text="   Organize Files", command=self.app.organize_files,
             fg_color="#2CC985", hover_color="#27AE60", height=38, width=180,
-            font=ctk.CTkFont(size=13, weight="bold"), image=self.icons.get("rocket"),
-            compound="left", anchor="center"
+            font=self._font(size=13, weight="bold"), anchor="center"
         ).pack(side="left", padx=(0, 10))
         
         # Cancel button
-        self.cancel_btn = ctk.CTkButton(
-            action_frame, text="   Cancel", command=self.app.cancel_operation,
-            state="disabled", height=38, width=120, font=ctk.CTkFont(size=13),
-            image=self.icons.get("cancel"), compound="left", anchor="center"
+        self.cancel_btn = self._icon_button(
+            action_frame, "cancel", text="   Cancel", command=self.app.cancel_operation,
+            state="disabled", height=38, width=120, font=self._font(size=13),
+            anchor="center"
         )
         self.cancel_btn.pack(side="left")
     
@@ -317,12 +451,12 @@ class MainWindow:
         
         # Status label
         status_label = ctk.CTkLabel(status_frame, textvariable=self.status_var,
-                                  font=ctk.CTkFont(size=11), anchor="w")
+                                  font=self._font(size=11), anchor="w")
         status_label.pack(side="left", padx=10)
         
         # Footer
         ctk.CTkLabel(status_frame, text="© 2025 File Organizer | A project by mggyslz",
-                    font=ctk.CTkFont(size=11), text_color="gray70",
+                    font=self._font(size=11), text_color="gray70",
                     anchor="center", height=25).pack(side="bottom", fill="x", pady=(0, 5))
     
     # =============================================================================
@@ -336,10 +470,18 @@ class MainWindow:
             self.folder_var.set(folder)
     
     def _on_folder_change(self, *args):
-        """Handle folder selection change"""
+        """Handle folder selection change once typing settles"""
+        if self._folder_change_job:
+            self.root.after_cancel(self._folder_change_job)
+        self._folder_change_job = self.root.after(250, self._do_folder_change)
+    
+    def _do_folder_change(self):
+        """Refresh the file count for the selected folder"""
+        self._folder_change_job = None
         folder = self.folder_var.get()
         if folder and os.path.isdir(folder):
-            self.app.update_file_count(folder)
+            # Already debounced here, so don't wait again in the controller
+            self.app.update_file_count(folder, delay_ms=0)
         else:
             self.file_count_var.set("Select a folder to see file count")
     
@@ -395,8 +537,17 @@ class MainWindow:
             'size_unit': self.size_unit_var.get()
         }
     
+    def _recompute_sizes(self, *args):
+        """Parse the size filter fields into byte counts"""
+        unit = self.size_unit_var.get()
+        self.min_size_bytes = self.app.convert_size_to_bytes(self.min_size_var.get(), unit)
+        self.max_size_bytes = self.app.convert_size_to_bytes(self.max_size_var.get(), unit, True)
+    
     def load_settings(self, settings: Dict):
         """Load settings into UI"""
+        # Detach the folder trace so the scan is scheduled once, with every filter already set
+        self.folder_var.trace_remove("write", self._folder_trace)
+        
         self.organize_by_date_var.set(settings.get('organize_by_date', False))
         self.move_files_var.set(settings.get('move_files', True))
         self.create_folders_var.set(settings.get('create_folders', True))
@@ -406,6 +557,9 @@ class MainWindow:
         self.min_size_var.set(settings.get('min_size', '0'))
         self.max_size_var.set(settings.get('max_size', ''))
         self.size_unit_var.set(settings.get('size_unit', 'MB'))
+        
+        self._folder_trace = self.folder_var.trace_add("write", self._on_folder_change)
+        self._on_folder_change()
     
     # =============================================================================
     # Dialog Windows
@@ -423,7 +577,7 @@ class MainWindow:
         
         # Title
         ctk.CTkLabel(frame, text="Folder Statistics", 
-                    font=ctk.CTkFont(size=14, weight="bold")).pack(pady=(0, 20))
+                    font=self._font(size=14, weight="bold")).pack(pady=(0, 20))
         
         # Statistics content
         content = f"""Total Files: {stats['total_files']}
@@ -458,20 +612,18 @@ File Size Distribution:
         text_widget = ctk.CTkTextbox(text_frame, wrap="word")
         text_widget.pack(fill="both", expand=True)
         
-        # Add preview content
-        content = "File Organization Preview:\n\n"
+        # Add preview content, collected in a list and joined once
         total_files = sum(len(files) for files in preview_data.values())
-        content += f"Total files to organize: {total_files}\n\n"
+        parts = ["File Organization Preview:\n\n", f"Total files to organize: {total_files}\n\n"]
         
         for category, files in preview_data.items():
-            content += f"📁 {category} ({len(files)} files):\n"
-            for file in files[:5]:  # Show first 5 files
-                content += f"   • {file}\n"
+            parts.append(f"📁 {category} ({len(files)} files):\n")
+            parts.extend(f"   • {file}\n" for file in files[:5])  # Show first 5 files
             if len(files) > 5:
-                content += f"   ... and {len(files) - 5} more files\n"
-            content += "\n"
+                parts.append(f"   ... and {len(files) - 5} more files\n")
+            parts.append("\n")
         
-        text_widget.insert("1.0", content)
+        text_widget.insert("1.0", "".join(parts))
         text_widget.configure(state="disabled")
         
         # Close button
@@ -479,6 +631,35 @@ File Size Distribution:
         button_frame.pack(pady=10)
         ctk.CTkButton(button_frame, text="Close", command=preview_window.destroy).pack()
     
+    def show_similar_files(self, pairs: List[Tuple[List[str], List[str], float]]):
+        """Show near-duplicate file pairs, most similar first, each file with its exact copies"""
+        similar_window = ctk.CTkToplevel(self.root)
+        similar_window.title("Similar Files")
+        similar_window.geometry("600x400")
+        self._bring_to_front(similar_window)
+        
+        text_frame = ctk.CTkFrame(similar_window)
+        text_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        text_widget = ctk.CTkTextbox(text_frame, wrap="word")
+        text_widget.pack(fill="both", expand=True)
+        
+        parts = [f"Found {len(pairs)} pairs of files with mostly the same content:\n\n"]
+        
+        def label(names):
+            extra = len(names) - 1
+            return f"{names[0]} (+{extra} identical {'copy' if extra == 1 else 'copies'})" if extra else names[0]
+        
+        parts.extend(f"• {label(names)} ↔ {label(others)} ({similarity:.0%} shared)\n"
+                     for names, others, similarity in pairs)
+        
+        text_widget.insert("1.0", "".join(parts))
+        text_widget.configure(state="disabled")
+        
+        button_frame = ctk.CTkFrame(similar_window)
+        button_frame.pack(pady=10)
+        ctk.CTkButton(button_frame, text="Close", command=similar_window.destroy).pack()
+    
     def show_duplicates(self, duplicates: Dict, folder: str, security_perf=None):
             """Show duplicates management window with improved error handling"""
             if not duplicates:
@@ -495,7 +676,7 @@ File Size Distribution:
             
             # Title and instructions
             ctk.CTkLabel(main_frame, text="Duplicate Files Found", 
-                        font=ctk.CTkFont(size=16, weight="bold")).pack(pady=(0, 5))
+                        font=self._font(size=16, weight="bold")).pack(pady=(0, 5))
             
             total_duplicates = sum(len(files) for files in duplicates.values())
             total_groups = len(duplicates)
@@ -503,119 +684,153 @@ File Size Distribution:
             instructions = (f"Found {total_duplicates} duplicate files in {total_groups} groups\n"
                         "Check files you want to delete (keep at least one per set)\n"
                         "Files grouped below are identical in content")
-            ctk.CTkLabel(main_frame, text=instructions, font=ctk.CTkFont(size=11),
+            ctk.CTkLabel(main_frame, text=instructions, font=self._font(size=11),
                         text_color="gray70").pack(pady=(0, 15))
             
-            # Create scrollable area for all duplicates
-            scroll_frame = ctk.CTkScrollableFrame(main_frame)
-            scroll_frame.pack(fill="both", expand=True, pady=(0, 10))
+            # One directory pass gives every row its size and date, instead of a stat per file
+            wanted = {filename for files in duplicates.values() for filename in files}
+            stat_cache = {}
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.name in wanted:
+                            try:
+                                stat_cache[entry.name] = entry.stat()
+                            except OSError:
+                                pass  # Vanished since the scan
+            except OSError:
+                pass
+            
+            # Full paths are built once here, from a prefix joined once
+            folder_prefix = os.path.join(folder, '')
             
-            file_checkboxes = {}
+            def reclaimable(group):
+                # Bytes freed by keeping one copy; files gone since the scan count as empty
+                sizes = [stat_cache[f].st_size for f in group[1] if f in stat_cache]
+                return sum(sizes) - max(sizes, default=0)
             
-            # Create sections for each duplicate group
-            for group_idx, (hash_val, files) in enumerate(duplicates.items()):
+            # Largest savings first, so the sets worth reviewing are at the top of the list
+            groups = sorted(duplicates.items(), key=reclaimable, reverse=True)
+            
+            # Flatten groups into rows: (group index, files, file index or None for the header)
+            rows = []
+            # Listed files as parallel arrays, indexed by file index
+            names = []  # Filename
+            paths = []  # Full path
+            checked = bytearray()  # 1 when marked for deletion
+            group_ranges = {}  # hash -> slice of checked holding that group's files
+            
+            for group_idx, (hash_val, files) in enumerate(groups):
                 if not files or len(files) < 2:
                     continue  # Skip invalid groups
-                    
-                # Group header
-                header_frame = ctk.CTkFrame(scroll_frame, fg_color="transparent")
-                header_frame.pack(fill="x", pady=(15, 5))
-                
-                # Calculate total size for this group
-                try:
-                    first_file_path = os.path.join(folder, files[0])
-                    if os.path.exists(first_file_path):
-                        file_size = os.path.getsize(first_file_path)
-                        size_text = self._format_size(file_size)
-                        wasted_space = file_size * (len(files) - 1)
-                        wasted_text = self._format_size(wasted_space)
-                        
-                        ctk.CTkLabel(header_frame, 
-                                    text=f"Duplicate Set {group_idx + 1} ({len(files)} files, {size_text} each, {wasted_text} wasted)",
-                                    font=ctk.CTkFont(size=12, weight="bold")).pack(side="left")
-                    else:
-                        ctk.CTkLabel(header_frame, 
-                                    text=f"Duplicate Set {group_idx + 1} ({len(files)} files)",
-                                    font=ctk.CTkFont(size=12, weight="bold")).pack(side="left")
-                except Exception:
-                    ctk.CTkLabel(header_frame, 
-                                text=f"Duplicate Set {group_idx + 1} ({len(files)} files)",
-                                font=ctk.CTkFont(size=12, weight="bold")).pack(side="left")
                 
-                # Create checkboxes for each file
+                rows.append((group_idx, files, None))
+                group_start = len(checked)
                 for i, filename in enumerate(files):
-                    file_path = os.path.join(folder, filename)
-                    
                     # Check if file still exists
-                    if not os.path.exists(file_path):
+                    if filename not in stat_cache:
                         continue
-                        
-                    file_frame = ctk.CTkFrame(scroll_frame)
-                    file_frame.pack(fill="x", pady=2)
                     
                     # Pre-check all except the first file in each group
-                    cb_var = ctk.IntVar(value=1 if i > 0 else 0)
-                    cb = ctk.CTkCheckBox(file_frame, text=filename, variable=cb_var)
-                    cb.pack(side="left", padx=(10, 10))
-                    
-                    # Show file info
-                    self._add_file_info(file_frame, file_path)
-                    file_checkboxes[filename] = (cb_var, file_frame, file_path)
+                    rows.append((group_idx, files, len(checked)))
+                    names.append(filename)
+                    paths.append(folder_prefix + filename)
+                    checked.append(1 if i > 0 else 0)
+                group_ranges[hash_val] = slice(group_start, len(checked))
             
-            # Action buttons
-            self._create_duplicate_action_buttons(main_frame, dup_window, duplicates, 
-                                                file_checkboxes, folder, security_perf)
-        
-    def _add_file_info(self, parent, file_path):
-        """Add file information labels with better error handling"""
-        try:
-            if not os.path.exists(file_path):
-                error_frame = ctk.CTkFrame(parent, fg_color="transparent")
-                error_frame.pack(side="left")
-                ctk.CTkLabel(error_frame, text="(File not found)",
-                            text_color="red").pack()
-                return
+            def create_row(canvas):
+                frame = ctk.CTkFrame(canvas)
+                bound = [None, None]  # [file index shown, whether the row is laid out as a header]
+                title = ctk.CTkLabel(frame, font=self._font(size=12, weight="bold"))
+                checkbox = ctk.CTkCheckBox(frame, text="",
+                                           command=lambda: toggle(bound[0]))
+                size_label = ctk.CTkLabel(frame, font=self._font(size=10), width=80)
+                date_label = ctk.CTkLabel(frame, font=self._font(size=10), width=120)
+                return (frame, frame.cget("fg_color"), title, checkbox, size_label, date_label, bound)
+            
+            def toggle(file_index):
+                checked[file_index] ^= 1
+            
+            def bind_row(row, index):
+                frame, row_color, title, checkbox, size_label, date_label, bound = row
+                group_idx, files, file_index = rows[index]
+                is_header = file_index is None
+                bound[0] = file_index
                 
-            stat = os.stat(file_path)
-            size = self._format_size(stat.st_size)
-            mod_time = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+                # Re-layout only when the row switches between header and file
+                if bound[1] != is_header:
+                    bound[1] = is_header
+                    for widget in (title, checkbox, size_label, date_label):
+                        widget.pack_forget()
+                    if is_header:
+                        frame.configure(fg_color="transparent")
+                        title.pack(side="left")
+                    else:
+                        frame.configure(fg_color=row_color)
+                        checkbox.pack(side="left", padx=(10, 10))
+                        size_label.pack(side="left", padx=(0, 10))
+                        date_label.pack(side="left", padx=(0, 10))
+                
+                if is_header:
+                    title.configure(text=self._duplicate_header_text(group_idx, files,
+                                                                     stat_cache.get(files[0])))
+                    return
+                
+                filename = names[file_index]
+                checkbox.configure(text=filename)
+                checkbox.select() if checked[file_index] else checkbox.deselect()
+                size_text, date_text = self._file_info_text(paths[file_index], stat_cache.get(filename))
+                size_label.configure(text=size_text)
+                date_label.configure(text=date_text)
             
-            # Size info
-            size_frame = ctk.CTkFrame(parent, fg_color="transparent", width=80)
-            size_frame.pack(side="left", padx=(0, 10))
-            ctk.CTkLabel(size_frame, text=size, font=ctk.CTkFont(size=10)).pack()
+            # A fixed pool of row widgets is rebound as the list scrolls
+            file_list = VirtualList(main_frame, create_row, bind_row, pady=(0, 10))
+            file_list.set_row_count(len(rows))
             
-            # Date info
-            date_frame = ctk.CTkFrame(parent, fg_color="transparent", width=120)
-            date_frame.pack(side="left", padx=(0, 10))
-            ctk.CTkLabel(date_frame, text=mod_time, font=ctk.CTkFont(size=10)).pack()
+            # Action buttons
+            self._create_duplicate_action_buttons(main_frame, dup_window, groups,
+                                                names, paths, checked, group_ranges, folder, security_perf)
+        
+    def _duplicate_header_text(self, group_idx, files, first_stat=None) -> str:
+        """Header text of one duplicate set, sized from its first file's stat"""
+        if first_stat is None:
+            return f"Duplicate Set {group_idx + 1} ({len(files)} files)"
+        
+        # Calculate total size for this group
+        file_size = first_stat.st_size
+        size_text = self._format_size(file_size)
+        wasted_text = self._format_size(file_size * (len(files) - 1))
+        return f"Duplicate Set {group_idx + 1} ({len(files)} files, {size_text} each, {wasted_text} wasted)"
+    
+    def _file_info_text(self, file_path, file_stat=None) -> Tuple[str, str]:
+        """Size and modification date of a file, using file_stat when the caller already has it
+        
+        Returns: (size text, date text)
+        """
+        try:
+            if file_stat is None:
+                if not os.path.exists(file_path):
+                    return "(File not found)", ""
+                file_stat = os.stat(file_path)
             
+            size = self._format_size(file_stat.st_size)
+            mod_time = time.strftime("%Y-%m-%d %H:%M", time.localtime(file_stat.st_mtime))
+            return size, mod_time
         except Exception as e:
-            error_frame = ctk.CTkFrame(parent, fg_color="transparent")
-            error_frame.pack(side="left")
-            ctk.CTkLabel(error_frame, text=f"(Error: {str(e)[:20]}...)",
-                        text_color="gray70", font=ctk.CTkFont(size=10)).pack()
+            return f"(Error: {str(e)[:20]}...)", ""
 
     
-    def _create_duplicate_action_buttons(self, parent, window, duplicates, file_checkboxes, folder, security_perf):
+    def _create_duplicate_action_buttons(self, parent, window, groups, names, paths, checked,
+                                         group_ranges, folder, security_perf):
         """Create action buttons for duplicate management with better validation"""
         button_frame = ctk.CTkFrame(parent)
         button_frame.pack(fill="x", pady=(10, 0))
         
         def delete_selected_duplicates():
-            # Validate selections
-            groups_to_check = {}
-            for hash_val, files in duplicates.items():
-                groups_to_check[hash_val] = []
-                for filename in files:
-                    if filename in file_checkboxes:
-                        cb_var, _, file_path = file_checkboxes[filename]
-                        if cb_var.get() == 1:
-                            groups_to_check[hash_val].append(filename)
-            
-            # Check that at least one file is kept in each group
-            for group_idx, (hash_val, files) in enumerate(duplicates.items()):
-                selected_for_deletion = len(groups_to_check.get(hash_val, []))
+            # Check that at least one file is kept in each group; each group is a contiguous byte range
+            for group_idx, (hash_val, files) in enumerate(groups):
+                group_range = group_ranges.get(hash_val)
+                selected_for_deletion = checked[group_range].count(1) if group_range else 0
                 total_in_group = len(files)
                 
                 if selected_for_deletion >= total_in_group:
@@ -625,7 +840,7 @@ File Size Distribution:
                     return
             
             # Count total files to delete
-            total_to_delete = sum(len(selected) for selected in groups_to_check.values())
+            total_to_delete = checked.count(1)
             
             if total_to_delete == 0:
                 messagebox.showwarning("Warning", "No files selected for deletion.")
@@ -636,25 +851,40 @@ File Size Distribution:
                 f"Permanently delete {total_to_delete} selected duplicate file(s)?"):
                 return
             
-            # Perform deletion
-            deleted_count = 0
-            errors = []
+            # Selections are read here; only the file I/O moves to worker threads
+            to_delete = [(filename, file_path)
+                         for filename, file_path, is_checked in zip(names, paths, checked)
+                         if is_checked]
+            
+            delete_btn.configure(state="disabled")
+            self.set_status(f"Deleting {len(to_delete)} duplicate file(s)...")
             
-            for filename, (cb_var, _, file_path) in file_checkboxes.items():
-                if cb_var.get() == 1:
-                    try:
-                        if not os.path.exists(file_path):
-                            errors.append(f"{filename}: File no longer exists")
-                            continue
-                            
-                        if security_perf:
-                            security_perf.secure_delete(file_path)
-                        else:
-                            os.remove(file_path)
-                        deleted_count += 1
-                    except Exception as e:
-                        errors.append(f"{filename}: {str(e)}")
+            def delete_file(item):
+                filename, file_path = item
+                try:
+                    if not os.path.exists(file_path):
+                        return f"{filename}: File no longer exists"
+                    
+                    if security_perf:
+                        security_perf.secure_delete(file_path)
+                    else:
+                        os.remove(file_path)
+                    return None
+                except Exception as e:
+                    return f"{filename}: {str(e)}"
             
+            def worker():
+                # Deletes are I/O bound, so several can be in flight at once
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    errors = [error for error in executor.map(delete_file, to_delete) if error]
+                try:
+                    self.root.after(0, lambda: show_results(len(to_delete) - len(errors), errors))
+                except RuntimeError:
+                    pass  # Main window already closed
+            
+            threading.Thread(target=worker, daemon=True).start()
+        
+        def show_results(deleted_count, errors):
             # Show results
             result_msg = f"Successfully deleted {deleted_count} duplicate file(s)"
             if errors:
@@ -665,8 +895,10 @@ File Size Distribution:
                 if len(errors) > 3:
                     result_msg += f"\n...and {len(errors)-3} more errors"
             
+            self.set_status(f"Deleted {deleted_count} duplicate file(s)")
             messagebox.showinfo("Deletion Results", result_msg)
-            window.destroy()
+            if window.winfo_exists():
+                window.destroy()
             
             # Update file count
             try:
@@ -681,66 +913,7 @@ File Size Distribution:
             command=delete_selected_duplicates,
             fg_color="#FF5555",
             hover_color="#FF0000",
-            font=ctk.CTkFont(size=12, weight="bold")
-        )
-        delete_btn.pack(side="left", padx=(0, 10))
-        
-        # Close button
-        ctk.CTkButton(button_frame, text="Close", command=window.destroy).pack(side="right")
-        """Create action buttons for duplicate management"""
-        button_frame = ctk.CTkFrame(parent)
-        button_frame.pack(fill="x", pady=(10, 0))
-        
-        def delete_selected_duplicates():
-            # Verify at least one file is kept in each group
-            for group_idx, (hash_val, files) in enumerate(duplicates.items()):
-                selected_for_deletion = sum(file_checkboxes[file][0].get() for file in files)
-                if selected_for_deletion == len(files):
-                    messagebox.showerror("Error", f"You must keep at least one file in Set {group_idx + 1}")
-                    return
-            
-            total_to_delete = sum(cb_var.get() for cb_var, _ in file_checkboxes.values())
-            if total_to_delete == 0:
-                messagebox.showwarning("Warning", "No files selected for deletion")
-                return
-            
-            if not messagebox.askyesno("Confirm", f"Permanently delete {total_to_delete} selected file(s)?"):
-                return
-            
-            deleted_count = 0
-            errors = []
-            
-            for file, (cb_var, _) in file_checkboxes.items():
-                if cb_var.get() == 1:
-                    file_path = os.path.join(folder, file)
-                    try:
-                        if security_perf:
-                            security_perf.secure_delete(file_path)
-                        else:
-                            os.remove(file_path)
-                        deleted_count += 1
-                    except Exception as e:
-                        errors.append(f"{os.path.basename(file)}: {str(e)}")
-            
-            # Show results
-            result_msg = f"Successfully deleted {deleted_count} file(s)"
-            if errors:
-                result_msg += f"\n\nFailed to delete {len(errors)} file(s):\n" + "\n".join(errors[:3])
-                if len(errors) > 3:
-                    result_msg += f"\n...and {len(errors)-3} more"
-            
-            messagebox.showinfo("Results", result_msg)
-            window.destroy()
-            self.app.update_file_count(folder)
-        
-        # Just a static delete button
-        delete_btn = ctk.CTkButton(
-            button_frame,
-            text="🗑️ Delete",
-            command=delete_selected_duplicates,
-            fg_color="#FF5555",
-            hover_color="#FF0000",
-            font=ctk.CTkFont(size=12, weight="bold")
+            font=self._font(size=12, weight="bold")
         )
         delete_btn.pack(side="left", padx=(0, 10))
         
@@ -760,10 +933,10 @@ File Size Distribution:
 
         # Instructions
         ctk.CTkLabel(main_frame, text="Edit File Type Categories", 
-                    font=ctk.CTkFont(size=12, weight="bold")).pack(pady=(0, 10))
+                    font=self._font(size=12, weight="bold")).pack(pady=(0, 10))
         
         ctk.CTkLabel(main_frame, text="Add extensions with dots (e.g., .pdf, .jpg)", 
-                    font=ctk.CTkFont(size=10, slant="italic")).pack(pady=(0, 10))
+                    font=self._font(size=10, slant="italic")).pack(pady=(0, 10))
 
         # Textbox for displaying file types
         list_frame = ctk.CTkFrame(main_frame)
@@ -772,20 +945,37 @@ File Size Distribution:
         textbox = ctk.CTkTextbox(list_frame, width=70, height=15)
         textbox.pack(fill="both", expand=True)
         textbox.configure(state="disabled")
+        textbox.tag_config("selected", background="#1F538D")
+        
+        # Each listed category is tagged with its row, so a click resolves to an item directly
+        row_of_tag = {}  # Row tag -> index into textbox._items
+        selected = [None]  # Index of the clicked category
 
         # Populate and refresh textbox
         def refresh_textbox():
             textbox.configure(state="normal")
             textbox.delete("1.0", "end")
             items = []
-            for category, extensions in file_types.items():
-                line = f"{category}: {', '.join(extensions)}\n"
-                textbox.insert("end", line)
+            row_of_tag.clear()
+            for i, (category, extensions) in enumerate(file_types.items()):
+                line = f"{category}: {', '.join(sorted(extensions))}\n"
+                row_of_tag[f"row{i}"] = i
+                textbox.insert("end", line, f"row{i}")
                 items.append((category, extensions))
             textbox.configure(state="disabled")
             textbox._items = items
+            selected[0] = None
 
         refresh_textbox()
+        
+        def select_row(event):
+            textbox.tag_remove("selected", "1.0", "end")
+            selected[0] = None
+            for tag in textbox.tag_names(f"@{event.x},{event.y}"):
+                if tag in row_of_tag:
+                    selected[0] = row_of_tag[tag]
+                    textbox.tag_add("selected", *textbox.tag_ranges(tag))
+                    break
 
         # Entry fields
         entry_frame = ctk.CTkFrame(main_frame)
@@ -832,11 +1022,8 @@ File Size Distribution:
                 messagebox.showwarning("Warning", "No categories to remove.")
                 return
             
-            cursor_pos = textbox.index("insert")
-            line_num = int(cursor_pos.split('.')[0]) - 1
-            
-            if 0 <= line_num < len(textbox._items):
-                cat, _ = textbox._items[line_num]
+            if selected[0] is not None:
+                cat, _ = textbox._items[selected[0]]
                 if messagebox.askyesno("Confirm", f"Remove category '{cat}'?"):
                     file_types.pop(cat, None)
                     refresh_textbox()
@@ -849,13 +1036,10 @@ File Size Distribution:
             if not hasattr(textbox, "_items") or not textbox._items:
                 return
             
-            cursor_pos = textbox.index("insert")
-            line_num = int(cursor_pos.split('.')[0]) - 1
-            
-            if 0 <= line_num < len(textbox._items):
-                cat, extensions = textbox._items[line_num]
+            if selected[0] is not None:
+                cat, extensions = textbox._items[selected[0]]
                 cat_var.set(cat)
-                ext_var.set(', '.join(extensions))
+                ext_var.set(', '.join(sorted(extensions)))
 
         # Buttons
         button_frame = ctk.CTkFrame(main_frame)
@@ -868,7 +1052,8 @@ File Size Distribution:
         ctk.CTkButton(button_frame, text="📝 Edit Selected", 
                       command=load_selection).pack(side="left")
 
-        # Bind double-click to edit
+        # Click selects a category, double-click loads it for editing
+        textbox.bind('<Button-1>', select_row)
         textbox.bind('<Double-1>', lambda e: load_selection())
     
     def show_manual_assignment(self, files: List[str], file_types: Dict[str, List[str]],
@@ -889,11 +1074,11 @@ File Size Distribution:
         header_frame.pack(fill="x", pady=(15, 20))
 
         ctk.CTkLabel(header_frame, text="Manual File Assignment", 
-                    font=ctk.CTkFont(size=20, weight="bold")).pack()
+                    font=self._font(size=20, weight="bold")).pack()
 
         ctk.CTkLabel(header_frame, 
                     text="Select files and assign categories • Use Ctrl+Click for multiple selection",
-                    font=ctk.CTkFont(size=11),
+                    font=self._font(size=11),
                     text_color=("#666666", "#CCCCCC")).pack(pady=(5, 0))
 
         # Create the main interface
@@ -917,18 +1102,31 @@ File Size Distribution:
         right_panel.pack(side="right", fill="y")
         right_panel.pack_propagate(False)
         
-        # Get available categories
-        def get_categories():
+        # Subfolders are listed once and shared by the category list and the folder dialogs
+        try:
+            subfolders = self._list_subfolders(folder)
+        except OSError:
+            subfolders = []
+        
+        # Get available categories; built once and rebuilt only after a folder is added or deleted
+        categories_cache = [None]
+        tags = [tag.strip() for tag in custom_tags.split(",") if tag.strip()]  # Fixed for this window
+        
+        def get_categories(rescan=False):
+            if rescan:
+                categories_cache[0] = None
+                try:
+                    subfolders[:] = self._list_subfolders(folder)
+                except OSError:
+                    pass
+            if categories_cache[0] is not None:
+                return categories_cache[0]
             categories = list(file_types.keys())
-            categories.extend([tag.strip() for tag in custom_tags.split(",") if tag.strip()])
-            try:
-                subfolders = [f for f in os.listdir(folder) 
-                            if os.path.isdir(os.path.join(folder, f)) and not f.startswith('.')]
-                categories.extend(subfolders)
-            except Exception:
-                pass
+            categories.extend(tags)
+            categories.extend(subfolders)
             categories.append("None")
-            return sorted(list(set(categories)))
+            categories_cache[0] = sorted(dict.fromkeys(categories))
+            return categories_cache[0]
         
         # ===== FILE LIST PANEL =====
         # Panel header
@@ -936,11 +1134,11 @@ File Size Distribution:
         list_header.pack(fill="x", padx=15, pady=(15, 12))
         
         ctk.CTkLabel(list_header, text="Files", 
-                    font=ctk.CTkFont(size=14, weight="bold")).pack(side="left")
+                    font=self._font(size=14, weight="bold")).pack(side="left")
         
         # Selection counter
         selected_counter = ctk.CTkLabel(list_header, text="0 selected",
-                                    font=ctk.CTkFont(size=11),
+                                    font=self._font(size=11),
                                     text_color=("#666666", "#CCCCCC"))
         selected_counter.pack(side="right")
         
@@ -955,27 +1153,26 @@ File Size Distribution:
                                 corner_radius=8)
         search_entry.pack(fill="x")
         
-        # File list with modern cards
-        scroll_frame = ctk.CTkScrollableFrame(left_panel, corner_radius=8)
-        scroll_frame.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+        # File list with modern cards; a fixed pool of cards is rebound as the list scrolls
+        selected = bytearray(len(files))  # One byte per file, 1 when selected; survives card recycling
+        shown_files = list(range(len(files)))  # Indices of the files matching the search
+        selected_count = [0]
         
-        file_checkboxes = {}
-        file_frames = {}
-        
-        for i, file in enumerate(files):
-            current_assignment = manual_assignments.get(file, "None")
+        def create_card(canvas):
+            row = ctk.CTkFrame(canvas, fg_color="transparent")
+            bound = [None]  # Index of the file shown in this card
             
             # Modern file card
-            card = ctk.CTkFrame(scroll_frame, corner_radius=8, height=50)
-            card.pack(fill="x", pady=(0, 6))
+            card = ctk.CTkFrame(row, corner_radius=8, height=50)
+            card.pack(fill="both", expand=True, pady=(0, 6))
             
             # Card content
             card_content = ctk.CTkFrame(card, fg_color="transparent")
             card_content.pack(fill="both", expand=True, padx=12, pady=10)
             
             # Checkbox
-            var = ctk.IntVar(value=0)
-            cb = ctk.CTkCheckBox(card_content, text="", variable=var, width=18)
+            cb = ctk.CTkCheckBox(card_content, text="", width=18,
+                                 command=lambda: toggle(bound[0]))
             cb.pack(side="left", padx=(0, 10))
             
             # File info
@@ -983,32 +1180,73 @@ File Size Distribution:
             info_frame.pack(side="left", fill="x", expand=True)
             
             # File name
-            name_label = ctk.CTkLabel(info_frame, text=file, anchor="w",
-                                    font=ctk.CTkFont(size=12))
+            name_label = ctk.CTkLabel(info_frame, anchor="w", height=20, font=self._font(size=12))
             name_label.pack(fill="x")
             
             # Category badge
-            category_color = "#4CAF50" if current_assignment != "None" else "#666666"
-            assign_label = ctk.CTkLabel(info_frame, 
-                                    text=f"📁 {current_assignment}",
-                                    anchor="w",
-                                    font=ctk.CTkFont(size=10),
-                                    text_color=category_color)
+            assign_label = ctk.CTkLabel(info_frame, anchor="w", height=16, font=self._font(size=10))
             assign_label.pack(fill="x", pady=(1, 0))
             
-            file_checkboxes[file] = (var, assign_label)
-            file_frames[file] = card
+            return (row, cb, name_label, assign_label, bound)
+        
+        def bind_card(row, index):
+            _, cb, name_label, assign_label, bound = row
+            file_index = bound[0] = shown_files[index]
+            file = files[file_index]
+            current_assignment = manual_assignments.get(file, "None")
+            category_color = "#4CAF50" if current_assignment != "None" else "#666666"
+            
+            cb.select() if selected[file_index] else cb.deselect()
+            name_label.configure(text=file)
+            assign_label.configure(text=f"📁 {current_assignment}", text_color=category_color)
+        
+        file_list = VirtualList(left_panel, create_card, bind_card, row_height=64,
+                                padx=15, pady=(0, 15))
+        file_list.set_row_count(len(shown_files))
+        
+        # Update selection info; a toggle adjusts the count instead of re-reading every file
+        def toggle(file_index):
+            selected[file_index] ^= 1
+            selected_count[0] += 1 if selected[file_index] else -1
+            selected_counter.configure(text=f"{selected_count[0]} selected")
+        
+        def selection_changed():
+            selected_count[0] = selected.count(1)
+            selected_counter.configure(text=f"{selected_count[0]} selected")
+            file_list.refresh()
+        
+        # Search functionality, run once typing pauses instead of on every keystroke
+        search_job = [None]
+        lower_names = [file.lower() for file in files]  # Lowercased once, not per keystroke
+        trigram_index = {}  # Trigram -> indices of the files containing it, built on first use
+        
+        def matching_files(keyword):
+            if len(keyword) < 3 or len(files) <= 2000:
+                return [i for i, name in enumerate(lower_names) if keyword in name]
+            
+            # Large lists: only files holding every trigram of the keyword can contain it
+            if not trigram_index:
+                for i, name in enumerate(lower_names):
+                    for start in range(len(name) - 2):
+                        trigram_index.setdefault(name[start:start + 3], set()).add(i)
+            postings = sorted((trigram_index.get(keyword[start:start + 3], frozenset())
+                               for start in range(len(keyword) - 2)), key=len)
+            candidates = postings[0].intersection(*postings[1:])
+            return [i for i in sorted(candidates) if keyword in lower_names[i]]
         
-        # Search functionality
         def search_files():
-            keyword = search_var.get().lower()
-            for file, frame in file_frames.items():
-                if keyword in file.lower():
-                    frame.pack(fill="x", pady=(0, 6))
-                else:
-                    frame.pack_forget()
+            search_job[0] = None
+            if not window.winfo_exists():
+                return
+            shown_files[:] = matching_files(search_var.get().lower())
+            file_list.set_row_count(len(shown_files))
         
-        search_var.trace_add("write", lambda *args: search_files())
+        def on_search_change(*args):
+            if search_job[0]:
+                self.root.after_cancel(search_job[0])
+            search_job[0] = self.root.after(150, search_files)
+        
+        search_var.trace_add("write", on_search_change)
         
         # ===== CONTROL PANEL =====
         # Panel header
@@ -1016,7 +1254,7 @@ File Size Distribution:
         control_header.pack(fill="x", padx=15, pady=(15, 15))
         
         ctk.CTkLabel(control_header, text="Actions", 
-                    font=ctk.CTkFont(size=14, weight="bold")).pack()
+                    font=self._font(size=14, weight="bold")).pack()
         
         # Category assignment section
         category_section = ctk.CTkFrame(right_panel, corner_radius=8, border_width=1, border_color=("#DDDDDD", "#444444"))
@@ -1027,7 +1265,7 @@ File Size Distribution:
         cat_content.pack(fill="x", padx=12, pady=12)
         
         ctk.CTkLabel(cat_content, text="Assign Category",
-                    font=ctk.CTkFont(size=12, weight="bold")).pack(anchor="w", pady=(0, 8))
+                    font=self._font(size=12, weight="bold")).pack(anchor="w", pady=(0, 8))
         
         # Category dropdown
         category_var = ctk.StringVar(value="None")
@@ -1040,7 +1278,7 @@ File Size Distribution:
         # Assign button
         assign_btn = ctk.CTkButton(cat_content,
                                 text="✓ Assign to Selected",
-                                command=lambda: self._assign_to_selected(file_checkboxes, manual_assignments, category_var, selected_counter),
+                                command=lambda: self._assign_to_selected(files, selected, manual_assignments, category_var, file_list),
                                 height=32,
                                 corner_radius=8)
         assign_btn.pack(fill="x")
@@ -1053,18 +1291,19 @@ File Size Distribution:
         sel_content.pack(fill="x", padx=12, pady=12)
         
         ctk.CTkLabel(sel_content, text="Selection",
-                    font=ctk.CTkFont(size=12, weight="bold")).pack(anchor="w", pady=(0, 8))
+                    font=self._font(size=12, weight="bold")).pack(anchor="w", pady=(0, 8))
         
         # Selection buttons
         sel_btn_frame = ctk.CTkFrame(sel_content, fg_color="transparent")
         sel_btn_frame.pack(fill="x")
         
         ctk.CTkButton(sel_btn_frame, text="Select All",
-                    command=lambda: self._select_unassigned(file_checkboxes, manual_assignments),
+                    command=lambda: self._select_unassigned(files, selected, manual_assignments,
+                                                            selection_changed),
                     width=85, height=28).pack(side="left", padx=(0, 6))
         
         ctk.CTkButton(sel_btn_frame, text="Clear",
-                    command=lambda: self._clear_selection(file_checkboxes),
+                    command=lambda: self._clear_selection(selected, selection_changed),
                     width=70, height=28).pack(side="right")
         
         # Folder management
@@ -1075,7 +1314,7 @@ File Size Distribution:
         folder_content.pack(fill="x", padx=12, pady=12)
         
         ctk.CTkLabel(folder_content, text="Folders",
-                    font=ctk.CTkFont(size=12, weight="bold")).pack(anchor="w", pady=(0, 8))
+                    font=self._font(size=12, weight="bold")).pack(anchor="w", pady=(0, 8))
         
         # Folder buttons
         folder_btn_frame = ctk.CTkFrame(folder_content, fg_color="transparent")
@@ -1086,24 +1325,18 @@ File Size Distribution:
                     width=85, height=28).pack(side="left", padx=(0, 6))
         
         ctk.CTkButton(folder_btn_frame, text="🗑️ Delete",
-                    command=lambda: self._delete_folder(window, folder, category_combo, get_categories),
+                    command=lambda: self._delete_folder(window, folder, category_combo, get_categories,
+                                                        subfolders),
                     width=70, height=28,
                     fg_color="#FF5555",
                     hover_color="#FF0000").pack(side="right")
         
-        # Update selection info
-        def update_selection_info():
-            selected_count = sum(var.get() for var, _ in file_checkboxes.values())
-            selected_counter.configure(text=f"{selected_count} selected")
-        
-        for var, _ in file_checkboxes.values():
-            var.trace_add("write", lambda *args: update_selection_info())
-        
         # Bottom action bar
         self._create_bottom_actions(parent, window, manual_assignments, save_callback)
 
-    def _assign_to_selected(self, file_checkboxes, manual_assignments, category_var, counter):
-        selected_files = [file for file, (var, label) in file_checkboxes.items() if var.get() == 1]
+    def _assign_to_selected(self, files, selected, manual_assignments, category_var, file_list):
+        # files and selected are parallel arrays, so compress picks the selection in one C-level pass
+        selected_files = list(compress(files, selected))
         
         if not selected_files:
             messagebox.showwarning("Warning", "Please select files to assign.")
@@ -1111,27 +1344,34 @@ File Size Distribution:
         
         category = category_var.get()
         
-        for file in selected_files:
-            if category == "None":
+        if category == "None":
+            for file in selected_files:
                 manual_assignments.pop(file, None)
-            else:
-                manual_assignments[file] = category
-            
-            current_assignment = manual_assignments.get(file, "None")
-            category_color = "#4CAF50" if current_assignment != "None" else "#666666"
-            file_checkboxes[file][1].configure(text=f"📁 {current_assignment}",
-                                            text_color=category_color)
+        else:
+            manual_assignments.update(dict.fromkeys(selected_files, category))
+        
+        # Visible cards pick up the new category badges
+        file_list.refresh()
         
         messagebox.showinfo("Success", f"Assigned {len(selected_files)} files to '{category}'")
 
-    def _select_unassigned(self, file_checkboxes, manual_assignments):
-        for file, (var, _) in file_checkboxes.items():
-            var.set(1 if file not in manual_assignments else 0)
+    def _select_unassigned(self, files, selected, manual_assignments, on_change):
+        selected[:] = bytes(file not in manual_assignments for file in files)
+        on_change()
 
-    def _clear_selection(self, file_checkboxes):
-        for var, _ in file_checkboxes.values():
-            var.set(0)
+    def _clear_selection(self, selected, on_change):
+        selected[:] = bytes(len(selected))
+        on_change()
 
+    @staticmethod
+    def _list_subfolders(folder: str) -> List[str]:
+        """List non-hidden subfolders in one scandir pass, no stat per entry"""
+        # follow_symlinks=False answers from the readdir d_type alone and keeps linked
+        # folders out of the delete dialog, where removal would walk the link's target
+        with os.scandir(folder) as entries:
+            return [entry.name for entry in entries
+                    if not entry.name.startswith('.') and entry.is_dir(follow_symlinks=False)]
+    
     def _add_folder(self, base_folder, category_combo, get_categories_func):
         dialog = ctk.CTkInputDialog(text="Enter folder name:", title="Create New Folder")
         folder_name = dialog.get_input()
@@ -1144,20 +1384,13 @@ File Size Distribution:
                     os.makedirs(folder_path)
                     messagebox.showinfo("Success", f"Folder '{folder_name}' created!")
                     # Update categories dropdown without closing dialog
-                    category_combo.configure(values=get_categories_func())
+                    category_combo.configure(values=get_categories_func(rescan=True))
                 else:
                     messagebox.showwarning("Warning", f"Folder '{folder_name}' already exists")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to create folder: {str(e)}")
 
-    def _delete_folder(self, parent_window, base_folder, category_combo, get_categories_func):
-        try:
-            folders = [f for f in os.listdir(base_folder) 
-                    if os.path.isdir(os.path.join(base_folder, f)) and not f.startswith('.')]
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not list folders: {str(e)}")
-            return
-        
+    def _delete_folder(self, parent_window, base_folder, category_combo, get_categories_func, folders):
         if not folders:
             messagebox.showwarning("Warning", "No folders available to delete")
             return
@@ -1174,7 +1407,7 @@ File Size Distribution:
         
         # Header
         ctk.CTkLabel(main_frame, text="Delete Folder",
-                    font=ctk.CTkFont(size=16, weight="bold")).pack(pady=(15, 20))
+                    font=self._font(size=16, weight="bold")).pack(pady=(15, 20))
         
         # Folder selection
         ctk.CTkLabel(main_frame, text="Select folder to delete:").pack(pady=(0, 8))
@@ -1191,26 +1424,37 @@ File Size Distribution:
         def perform_delete():
             folder_name = folder_var.get()
             folder_path = os.path.join(base_folder, folder_name)
+            force = force_var.get()
+            dialog.destroy()
             
-            try:
-                if os.path.exists(folder_path):
-                    if force_var.get():
-                        import stat
-                        def remove_readonly(func, path, _):
-                            os.chmod(path, stat.S_IWRITE)
-                            func(path)
-                        shutil.rmtree(folder_path, onerror=remove_readonly)
-                    else:
-                        shutil.rmtree(folder_path)
-                    
-                    messagebox.showinfo("Success", f"Folder '{folder_name}' deleted!")
-                    category_combo.configure(values=get_categories_func())
+            if not os.path.exists(folder_path):
+                messagebox.showwarning("Warning", f"Folder '{folder_name}' doesn't exist")
+                return
+            
+            def finish(error):
+                if error:
+                    self.set_status(f"Could not delete folder '{folder_name}'")
+                    messagebox.showerror("Error", f"Error deleting folder: {error}")
                 else:
-                    messagebox.showwarning("Warning", f"Folder '{folder_name}' doesn't exist")
-            except Exception as e:
-                messagebox.showerror("Error", f"Error deleting folder: {str(e)}")
-            finally:
-                dialog.destroy()
+                    self.set_status(f"Deleted folder '{folder_name}'")
+                    messagebox.showinfo("Success", f"Folder '{folder_name}' deleted!")
+                if category_combo.winfo_exists():
+                    category_combo.configure(values=get_categories_func(rescan=True))
+            
+            def worker():
+                # Large trees take a while; keep the window responsive meanwhile
+                try:
+                    self.app.file_ops.remove_tree(folder_path, force=force)
+                    error = None
+                except Exception as e:
+                    error = str(e)
+                try:
+                    self.root.after(0, lambda: finish(error))
+                except RuntimeError:
+                    pass  # Main window already closed
+            
+            self.set_status(f"Deleting folder '{folder_name}'...")
+            threading.Thread(target=worker, daemon=True).start()
         
         # Action buttons
         btn_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -1268,15 +1512,12 @@ File Size Distribution:
         if size_bytes == 0:
             return "0 B"
         
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
+        # Each unit is 2**10 times the previous one, so the bit length picks it directly
         unit_index = 0
-        size = float(size_bytes)
-        
-        while size >= 1024 and unit_index < len(units) - 1:
-            size /= 1024
-            unit_index += 1
+        if size_bytes >= 1024:
+            unit_index = min(len(SIZE_UNITS) - 1, (int(size_bytes).bit_length() - 1) // 10)
         
-        return f"{size:.1f} {units[unit_index]}"
+        return f"{size_bytes / (1 << (unit_index * 10)):.1f} {SIZE_UNITS[unit_index]}"
     
     def _bring_to_front(self, window):
         """Bring window to front and focus"""